@@ -11,22 +11,33 @@ from PIL import Image
 from typing import Dict, Any, Optional, List
 import logging
 import re
+import threading
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 # Initialize EasyOCR reader (lazy initialization)
 _ocr_reader = None
+# Held while the reader is built, so concurrent first calls build it once
+_ocr_reader_lock = threading.Lock()
 
 def get_ocr_reader():
     """Get or initialize EasyOCR reader."""
     global _ocr_reader
     if _ocr_reader is None:
-        try:
-            _ocr_reader = easyocr.Reader(['en'], gpu=False, verbose=False)
-        except Exception as e:
-            logger.error(f"Failed to initialize EasyOCR: {str(e)}")
-            raise
+        with _ocr_reader_lock:
+            if _ocr_reader is None:
+                try:
+                    # CPU only; quantize the recognition model to int8 (easyocr's
+                    # default, but spelled out so it isn't lost). fbgemm is the x86
+                    # int8 backend, so use it where torch has it.
+                    import torch
+                    if 'fbgemm' in torch.backends.quantized.supported_engines:
+                        torch.backends.quantized.engine = 'fbgemm'
+                    _ocr_reader = easyocr.Reader(['en'], gpu=False, quantize=True, verbose=False)
+                except Exception as e:
+                    logger.error(f"Failed to initialize EasyOCR: {str(e)}")
+                    raise
     return _ocr_reader
 
 def extract_text_from_image(image: Image.Image, region: Optional[tuple] = None) -> List[Dict[str, Any]]:
@@ -10,11 +10,12 @@ def main(file, debug=True):
     """
     This function is used to extract the MRZ from an image
     As a precondition, image should be single page format
+    file can be a path or an already decoded BGR image (numpy array)
     """
     import logging
     logger = logging.getLogger(__name__)
     
-    img = cv2.imread(file)
+    img = file if isinstance(file, np.ndarray) else cv2.imread(file)
     if img is None:
         if debug:
             logger.error(f"Failed to load image: {file}")
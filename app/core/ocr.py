@@ -2,15 +2,22 @@ import easyocr
 import cv2
 import numpy as np
 from PIL import Image
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from .mrz_detect import main as mrz_main
 from mrz.checker.td3 import TD3CodeChecker
 import logging
-import tempfile
-import os
+import re
 
 logger = logging.getLogger(__name__)
 
+# MRZ cleanup patterns for fix_ocr_angle_brackets; MRZ text is ASCII only
+_MRZ_KEEP_RE = re.compile(r'[^A-Z0-9<>LI1\|/\-]', re.ASCII)
+_FILLER_LI1_RE = re.compile(r'[LI1]{3,}', re.ASCII)
+_FILLER_PIPE_RE = re.compile(r'\|{2,}', re.ASCII)
+_FILLER_SLASH_RE = re.compile(r'/{2,}', re.ASCII)
+_FILLER_MIXED_RE = re.compile(r'[<LI1\|]{3,}', re.ASCII)
+_MRZ_INVALID_RE = re.compile(r'[^A-Z0-9<]', re.ASCII)
+
 
 
 def fix_ocr_angle_brackets(text: str, target_length: int = None) -> str:
@@ -27,20 +34,18 @@ def fix_ocr_angle_brackets(text: str, target_length: int = None) -> str:
     Returns:
         Text with corrected '<' characters and proper length
     """
-    import re
-    
     # Step 1: Remove all whitespace and invalid characters
     # Keep potential misreadings (>, L, I, 1, |, /) for analysis
-    text = re.sub(r'[^A-Z0-9<>LI1\|/\-]', '', text)
+    text = _MRZ_KEEP_RE.sub('', text)
     
     # Step 2: Fix dashes and '>' characters
     text = text.replace('-', '<')
     text = text.replace('>', '<')  # OCR sometimes reads '<' as '>'
     
     # Step 3: Fix obvious misreadings (sequences of L/I/1 that should be '<')
-    text = re.sub(r'[LI1]{3,}', lambda m: '<' * len(m.group()), text)
-    text = re.sub(r'\|{2,}', lambda m: '<' * len(m.group()), text)
-    text = re.sub(r'/{2,}', lambda m: '<' * len(m.group()), text)
+    text = _FILLER_LI1_RE.sub(lambda m: '<' * len(m.group()), text)
+    text = _FILLER_PIPE_RE.sub(lambda m: '<' * len(m.group()), text)
+    text = _FILLER_SLASH_RE.sub(lambda m: '<' * len(m.group()), text)
     
     # Step 4: Fix mixed sequences
     def fix_mixed_sequence(match):
@@ -48,10 +53,10 @@ def fix_ocr_angle_brackets(text: str, target_length: int = None) -> str:
         if len(seq) >= 3:
             return '<' * len(seq)
         return seq
-    text = re.sub(r'[<LI1\|]{3,}', fix_mixed_sequence, text)
+    text = _FILLER_MIXED_RE.sub(fix_mixed_sequence, text)
     
     # Step 5: Final cleanup - remove any remaining invalid characters
-    text = re.sub(r'[^A-Z0-9<]', '', text)
+    text = _MRZ_INVALID_RE.sub('', text)
     
     # Step 6: Adjust length to target if specified
     # This is crucial - OCR often miscounts trailing '<' characters
@@ -330,25 +335,38 @@ def try_extract_mrz_at_orientation(img_bgr: np.ndarray, orientation: int = 0) ->
         else:
             img_rotated = img_bgr
         
-        # Save to temporary file for mrz_detect
-        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-            cv2.imwrite(tmp_path, img_rotated)
-        
-        try:
-            mrz_image = mrz_main(tmp_path, debug=False)
-            return mrz_image
-        finally:
-            if os.path.exists(tmp_path):
-                try:
-                    os.unlink(tmp_path)
-                except Exception:
-                    pass
+        # mrz_detect takes the array directly, no need to write it out
+        return mrz_main(img_rotated, debug=False)
     except Exception as e:
         logger.debug(f"MRZ extraction failed at orientation {orientation}: {str(e)}")
         return None
 
 
+def guess_mrz_orientations(img_bgr: np.ndarray) -> List[int]:
+    """
+    Order the orientations to try so the likely ones come first.
+    
+    Text lines make the edge density vary much more from row to row than
+    from column to column, so when rows vary more the document is upright
+    or upside down (0/180), otherwise it is on its side (90/270). The other
+    two orientations are still tried afterwards.
+    
+    Args:
+        img_bgr: BGR image as numpy array
+        
+    Returns:
+        All four orientations in degrees, most likely first
+    """
+    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY) if img_bgr.ndim == 3 else img_bgr
+    edges = cv2.Canny(gray, 50, 150)
+    # Means rather than sums, so the image's aspect ratio doesn't tip the scale
+    row_variation = edges.mean(axis=1).std()
+    column_variation = edges.mean(axis=0).std()
+    if row_variation >= column_variation:
+        return [0, 180, 90, 270]
+    return [90, 270, 0, 180]
+
+
 def extract_mrz_from_image(image: Image.Image) -> Optional[np.ndarray]:
     """
     Extract MRZ region from a PIL Image.
@@ -377,7 +395,7 @@ def extract_mrz_from_image(image: Image.Image) -> Optional[np.ndarray]:
         
         # Try extracting MRZ at different orientations
         # Passports can be scanned/photoed at different angles
-        orientations = [0, 90, 180, 270]
+        orientations = guess_mrz_orientations(img_bgr)
         
         for orientation in orientations:
             logger.debug(f"Trying MRZ extraction at {orientation} degrees")
@@ -442,9 +460,10 @@ def validate_document_ocr(document_image: Image.Image, document_type: Optional[s
                 "details": ["MRZ extraction failed"]
             }
         
-        # Initialize EasyOCR reader (lazy initialization could be added)
+        # Reuse the shared EasyOCR reader; loading the models dominates a cold call
         try:
-            reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+            from .id_ocr import get_ocr_reader
+            reader = get_ocr_reader()
         except Exception as e:
             logger.error(f"Failed to initialize EasyOCR: {str(e)}")
             return {
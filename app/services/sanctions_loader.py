@@ -4,6 +4,11 @@ from typing import Optional, ClassVar, List, Set, Dict, Any, Union, Tuple
 import logging
 import re
 from datetime import datetime
+try:
+    import pyarrow  # noqa: F401 - Parquet engine and Arrow-backed strings
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(
@@ -16,6 +21,8 @@ class SanctionsLoader:
     """Loader for combined sanctions data with caching and data normalization."""
     
     _cache: ClassVar[Optional[pd.DataFrame]] = None
+    # Files loaded by explicit path: resolved path -> (st_mtime_ns, DataFrame)
+    _file_cache: ClassVar[Dict[str, Tuple[int, pd.DataFrame]]] = {}
     _REQUIRED_COLUMNS = {"source", "record_type", "dataid", "name"}
     _STRING_COLUMNS = [
         "aliases", "nationalities", "pob_cities", "pob_countries",
@@ -46,6 +53,41 @@ class SanctionsLoader:
         logger.info(f"Using sanctions file: {latest}")
         return latest
 
+    @classmethod
+    def _read_sanctions_file(cls, path: Path) -> pd.DataFrame:
+        """
+        Read a combined sanctions file, preferring its Parquet copy.
+        
+        combine_sanctions.py writes a .parquet file next to each combined CSV
+        when pyarrow is installed. It is used if pyarrow is available here and
+        the copy is at least as new as the CSV; otherwise, or if it cannot be
+        read, the CSV is read instead.
+        """
+        csv_path = path.resolve()
+        parquet_path = csv_path.with_suffix('.parquet')
+        if (PYARROW_AVAILABLE and csv_path.suffix == '.csv' and parquet_path.exists()
+                and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime):
+            try:
+                df = pd.read_parquet(parquet_path)
+                logger.info(f"Loaded Parquet copy {parquet_path}")
+                return df
+            except Exception as e:
+                logger.warning(f"Could not read {parquet_path}, falling back to CSV: {e}")
+        
+        # Read every column as text with empty cells kept as "", the way
+        # combine_sanctions.py builds the frame it saves as Parquet, so both
+        # files load to the same frame
+        return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+    @staticmethod
+    def _search_key(values: pd.Series) -> pd.Series:
+        """Uppercase names, trim them and collapse runs of whitespace."""
+        if PYARROW_AVAILABLE:
+            # Arrow-backed strings run these as native compute kernels
+            # instead of a Python call per cell
+            values = values.astype("string[pyarrow]")
+        return values.str.upper().str.strip().str.replace(r'\s+', ' ', regex=True)
+
     @classmethod
     def _normalize_dataframe(cls, df: pd.DataFrame) -> pd.DataFrame:
         """Normalize the sanctions DataFrame according to requirements."""
@@ -63,17 +105,18 @@ class SanctionsLoader:
         if len(df) < initial_count:
             logger.info(f"Dropped {initial_count - len(df)} rows with empty names")
         
-        # Ensure all string columns exist and are properly typed
+        # Ensure all string columns exist and are properly typed; fill the
+        # ones that are there in one pass rather than column by column
+        present = [col for col in cls._STRING_COLUMNS if col in df.columns]
+        df[present] = df[present].fillna("").astype(str)
         for col in cls._STRING_COLUMNS:
             if col not in df.columns:
                 df[col] = ""
-            else:
-                df[col] = df[col].fillna("").astype(str)
         
         # Add/update special columns
         df['updated_at'] = df['last_updated'].fillna(df.get('processing_date', '')).fillna('')
-        df['search_name'] = df['name'].str.upper().str.strip().str.replace(r'\s+', ' ', regex=True)
-        df['search_aliases'] = df['aliases'].fillna('').str.upper().str.strip().str.replace(r'\s+', ' ', regex=True)
+        df['search_name'] = cls._search_key(df['name'])
+        df['search_aliases'] = cls._search_key(df['aliases'].fillna(''))
         
         return df
 
@@ -93,8 +136,12 @@ class SanctionsLoader:
             FileNotFoundError: If no sanctions file is found.
             ValueError: If the file is missing required columns.
         """
+        # Only the default (latest) file is cached; remember that before path
+        # is resolved below
+        use_cache = path is None
+        
         # If we have a cached version and no specific path is requested, return it
-        if cls._cache is not None and path is None:
+        if cls._cache is not None and use_cache:
             return cls._cache
         
         # Resolve the path to the sanctions file
@@ -113,16 +160,26 @@ class SanctionsLoader:
                 else:
                     raise FileNotFoundError(f"Sanctions file not found: {path}")
 
+        # A file loaded before is reused until its modification time changes
+        cache_key = str(path.resolve())
+        mtime_ns = path.stat().st_mtime_ns
+        cached = cls._file_cache.get(cache_key)
+        if cached is not None and cached[0] == mtime_ns:
+            if use_cache:
+                cls._cache = cached[1]
+            return cached[1]
+
         # Read the CSV with appropriate settings
         logger.info(f"Loading sanctions from {path}")
         try:
-            df = pd.read_csv(path, low_memory=False)
+            df = cls._read_sanctions_file(path)
             
             # Normalize the data
             df = cls._normalize_dataframe(df)
             
-            # Cache the result if no specific path was provided
-            if path is None:
+            cls._file_cache[cache_key] = (mtime_ns, df)
+            # Also keep it as the default if no specific path was provided
+            if use_cache:
                 cls._cache = df
             return df
             
@@ -134,6 +191,7 @@ class SanctionsLoader:
     def clear_cache(cls) -> None:
         """Clear the cached sanctions data."""
         cls._cache = None
+        cls._file_cache.clear()
         logger.debug("Sanctions cache cleared")
     
     @classmethod
@@ -12,6 +12,11 @@ import logging
 from datetime import datetime
 from typing import List, Dict, Any, Set, Optional
 import unicodedata
+try:
+    import pyarrow  # noqa: F401 - Parquet engine for DataFrame.to_parquet
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(
@@ -120,8 +125,9 @@ class SanctionsCombiner:
         # Combine all DataFrames
         combined_df = pd.concat(all_dfs, ignore_index=True)
         
-        # Add a unique ID for each record
-        combined_df['id'] = combined_df.index + 1
+        # Add a unique ID for each record; as text like every other column, so
+        # the CSV and its Parquet copy load with the same types
+        combined_df['id'] = (combined_df.index + 1).astype(str)
         
         return combined_df
     
@@ -145,6 +151,16 @@ class SanctionsCombiner:
         # Save to CSV
         df.to_csv(output_file, index=False, encoding='utf-8', quoting=1)
         
+        # Save a Parquet copy next to it; SanctionsLoader prefers it over the
+        # CSV since it loads much faster and keeps the column types
+        if PARQUET_AVAILABLE:
+            parquet_file = output_file.with_suffix('.parquet')
+            try:
+                df.to_parquet(parquet_file, index=False, compression='zstd')
+                logger.info(f"Saved Parquet copy: {parquet_file}")
+            except Exception as e:
+                logger.warning(f"Could not save Parquet copy: {e}")
+        
         # Create/update latest symlink
         latest_file = self.output_dir / "combined_sanctions_latest.csv"
         if latest_file.exists():
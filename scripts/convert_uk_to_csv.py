@@ -6,12 +6,15 @@ This script loads the UK sanctions ODS file and converts it to a normalized
 CSV format compatible with the existing EU and OFAC sanctions data.
 """
 
+import csv
+import os
 import re
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import logging
 from datetime import datetime, date
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Dict, List, Optional, Set, TextIO, Tuple, Any
 import unicodedata
 
 # Configure logging
@@ -25,6 +28,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Write buffer for CSV output (the default 8 KiB means many small writes)
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
 # Country code mappings
 COUNTRY_CODES = {
     'AF': 'AFGHANISTAN', 'AL': 'ALBANIA', 'DZ': 'ALGERIA', 'AD': 'ANDORRA',
@@ -271,89 +277,73 @@ def create_normalized_uk_data(uk_df: pd.DataFrame) -> pd.DataFrame:
     
     logger.info(f"Creating normalized UK data with {len(uk_df)} records")
     
-    # Clean up column names and data
-    uk_df.columns = [col.strip() for col in uk_df.columns]
-    uk_df = uk_df.fillna('')
-    
-    # Initialize the result list
-    normalized_records = []
-    
-    # Process each record
-    for _, row in uk_df.iterrows():
-        try:
-            # Basic record info
-            record = {
-                'source': 'UK',
-                'source_file': 'FCDO_SL_Wed_Nov_19_2025.ods',
-                'list_type': 'UK Sanctions List',
-                'dataid': str(row.get('Unique ID', '')).strip(),
-                'reference_number': str(row.get('OFSI Group ID', '')).strip() or str(row.get('Unique ID', '')).strip(),
-                'program': clean_text(row.get('Regime Name', '')),
-                'comments': clean_text(row.get('Sanctions Imposed', '')),
-                'last_updated': date.today().isoformat(),
-                'processing_date': date.today().isoformat()
-            }
-            
-            # Determine record type
-            record_type = str(row.get('Type', '')).strip().upper()
-            if 'INDIVIDUAL' in record_type:
-                record['record_type'] = 'individual'
-            elif 'ENTITY' in record_type or 'ORGANIZATION' in record_type:
-                record['record_type'] = 'entity'
-            elif 'VESSEL' in record_type or 'SHIP' in record_type or 'BOAT' in record_type:
-                record['record_type'] = 'vessel'
-            else:
-                record['record_type'] = 'other'
-            
-            # Process name
-            full_name = clean_text(row.get('Name', ''))
-            name_parts = parse_name(full_name)
-            
-            record.update({
-                'name': name_parts['name'],
-                'first_name': name_parts['first_name'],
-                'middle_name': name_parts['middle_name'],
-                'last_name': name_parts['last_name']
-            })
-            
-            # Extract nationalities from name and regime name
-            text_fields = [
-                full_name,
-                row.get('Regime Name', ''),
-                row.get('Designation Source', '')
-            ]
-            
-            nationalities = set()
-            for field in text_fields:
-                nationalities.update(extract_nationalities(field))
-            
-            record['nationalities'] = '; '.join(sorted(nationalities)) if nationalities else ''
-            
-            # Initialize other fields
-            record.update({
-                'aliases': '',  # UK data doesn't have separate aliases
-                'gender': '',   # UK doesn't provide gender
-                'pob_cities': '',
-                'pob_countries': '',
-                'dob_dates': '',
-                'dob_years': '',
-                'addresses': '',
-                'id_numbers': ''
-            })
-            
-            # Add to results
-            normalized_records.append(record)
-            
-        except Exception as e:
-            logger.error(f"Error processing record {row.get('Unique ID', 'unknown')}: {str(e)}")
-            continue
-    
-    # Create DataFrame from normalized records
-    if not normalized_records:
-        logger.error("No valid records were processed")
-        return pd.DataFrame()
+    # Look columns up by their stripped names rather than renaming/filling a
+    # copy of the whole frame; the caller's DataFrame is left untouched
+    raw_columns = {str(col).strip(): col for col in uk_df.columns}
+    
+    def column(name: str) -> pd.Series:
+        """Return a raw column as strings, or empty strings if it is missing."""
+        if name in raw_columns:
+            return uk_df[raw_columns[name]].fillna('').astype(str)
+        return pd.Series('', index=uk_df.index)
+    
+    # Compute each per-column transform once
+    today = date.today().isoformat()
+    unique_ids = column('Unique ID').str.strip()
+    group_ids = column('OFSI Group ID').str.strip()
+    regime_names = column('Regime Name')
+    full_names = column('Name').map(clean_text)
+    
+    # Determine record type (first matching keyword group wins)
+    types = column('Type').str.upper()
+    record_types = np.select(
+        [
+            types.str.contains('INDIVIDUAL', regex=False),
+            types.str.contains('ENTITY|ORGANIZATION'),
+            types.str.contains('VESSEL|SHIP|BOAT'),
+        ],
+        ['individual', 'entity', 'vessel'],
+        default='other'
+    )
+    name_parts = [parse_name(full_name) for full_name in full_names]
+    
+    # Extract nationalities from name, regime name and designation source
+    nationalities = [''] * len(uk_df)
+    for idx, fields in enumerate(zip(full_names, regime_names, column('Designation Source'))):
+        found = set()
+        for field in fields:
+            found.update(extract_nationalities(field))
+        if found:
+            nationalities[idx] = '; '.join(sorted(found))
+    
+    # Constant columns are given as scalars and broadcast by pandas
+    data = {
+        'source': 'UK',
+        'source_file': 'FCDO_SL_Wed_Nov_19_2025.ods',
+        'list_type': 'UK Sanctions List',
+        'dataid': unique_ids,
+        'reference_number': group_ids.where(group_ids != '', unique_ids),
+        'program': regime_names.map(clean_text),
+        'comments': column('Sanctions Imposed').map(clean_text),
+        'last_updated': today,
+        'processing_date': today,
+        'record_type': record_types,
+        'name': [parts['name'] for parts in name_parts],
+        'first_name': [parts['first_name'] for parts in name_parts],
+        'middle_name': [parts['middle_name'] for parts in name_parts],
+        'last_name': [parts['last_name'] for parts in name_parts],
+        'nationalities': nationalities,
+        'aliases': '',  # UK data doesn't have separate aliases
+        'gender': '',   # UK doesn't provide gender
+        'pob_cities': '',
+        'pob_countries': '',
+        'dob_dates': '',
+        'dob_years': '',
+        'addresses': '',
+        'id_numbers': ''
+    }
     
-    normalized_df = pd.DataFrame(normalized_records)
+    normalized_df = pd.DataFrame(data, index=uk_df.index).reset_index(drop=True)
     
     # Reorder columns to match other sanctions lists
     column_order = [
@@ -377,6 +367,18 @@ def create_normalized_uk_data(uk_df: pd.DataFrame) -> pd.DataFrame:
     
     return normalized_df
 
+def open_csv_output(path: Path) -> TextIO:
+    """
+    Open a CSV output file for writing with a large write buffer.
+    
+    Args:
+        path: Path to the output file
+        
+    Returns:
+        Text file object ready for csv/pandas writers
+    """
+    return open(path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+
 def save_output(df: pd.DataFrame, output_path: Path) -> None:
     """
     Save the normalized data to a CSV file with proper formatting.
@@ -391,12 +393,10 @@ def save_output(df: pd.DataFrame, output_path: Path) -> None:
         
         # Build save arguments
         save_args = {
-            'path_or_buf': output_path,
             'index': False,
-            'encoding': 'utf-8',
-            'quoting': 1,  # Quote all fields
+            'quoting': csv.QUOTE_MINIMAL,  # Only quote fields that need it
             'quotechar': '"',
-            'escapechar': '\\',
+            'escapechar': '\\',  # Keeps backslashes intact for combine_sanctions.py's reader
             'date_format': '%Y-%m-%d'
         }
         
@@ -404,8 +404,9 @@ def save_output(df: pd.DataFrame, output_path: Path) -> None:
         import pandas as pd
         if pd.__version__ < '2.0.0':
             save_args['line_terminator'] = '\n'
-        # Save the DataFrame
-        df.to_csv(**save_args)
+        # Save the DataFrame through a large buffered file handle
+        with open_csv_output(output_path) as fh:
+            df.to_csv(fh, **save_args)
         logger.info(f"Successfully saved output to {output_path}")
         
     except Exception as e:
@@ -450,11 +451,13 @@ def main():
         # Save the data
         save_output(normalized_df, output_path)
         
-        # Create/update the latest symlink
+        # Create/update the latest symlink atomically: link under a temp
+        # name, then rename over the old link so it never goes missing
         try:
-            if latest_path.exists():
-                latest_path.unlink()
-            latest_path.symlink_to(output_path.name)
+            tmp_link = latest_path.with_name(latest_path.name + ".tmp")
+            tmp_link.unlink(missing_ok=True)
+            os.symlink(output_path.name, tmp_link)
+            os.replace(tmp_link, latest_path)
             logger.info(f"Created symlink: {latest_path} -> {output_path.name}")
         except OSError as e:
             logger.warning(f"Could not create symlink: {e}")
@@ -5,15 +5,21 @@ Convert UN sanctions XML to CSV format
 This script parses the UN sanctions XML file (consolidatedLegacyByPRN.xml) and converts it to a normalized
 CSV format compatible with the existing EU and UK sanctions data.
 """
-import xml.etree.ElementTree as ET
 import csv
 import logging
+import multiprocessing
+import os
 import re
+import sys
 import unicodedata
-import pandas as pd
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
+from lxml import etree
 from datetime import datetime, date
-from typing import List, Dict, Optional, Set, Any, Tuple
+from typing import List, Dict, Iterator, Optional, Set, Any, TextIO, Tuple
 
 # Configure logging
 logging.basicConfig(
@@ -26,86 +32,164 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Output column order, matching the other sanctions lists
+COLUMN_ORDER = [
+    'source', 'source_file', 'dataid', 'reference_number', 'list_type',
+    'record_type', 'name', 'first_name', 'middle_name', 'last_name',
+    'aliases', 'nationalities', 'gender', 'pob_cities', 'pob_countries',
+    'dob_dates', 'dob_years', 'addresses', 'id_numbers', 'program',
+    'comments', 'listed_on', 'last_updated', 'processing_date', 'un_list_type'
+]
+
+# Write buffer for CSV output (the default 8 KiB means many small writes)
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Number of INDIVIDUAL elements handed to each parser process at a time
+PARSE_BATCH_SIZE = 512
+# Environment variable capping the parser processes, for callers that run
+# other work alongside this converter
+PARSE_WORKERS_ENV = "UN_PARSE_WORKERS"
+# Rows handed to csv.writer.writerows() at a time
+WRITE_BATCH_SIZE = 1024
+
+# Whitespace runs, and whitespace other than a single space
+_WS = re.compile(r'\s+')
+_UNCLEAN_WS = re.compile(r'[^\S ]| {2}')
+
+# INDIVIDUAL children that repeat and are read as elements; every other
+# child is read for its text (see sweep_children)
+_GROUPED_CHILD_TAGS = frozenset((
+    "NATIONALITY", "LIST_TYPE", "LAST_DAY_UPDATED",
+    "INDIVIDUAL_ALIAS", "INDIVIDUAL_DATE_OF_BIRTH", "INDIVIDUAL_PLACE_OF_BIRTH",
+    "INDIVIDUAL_ADDRESS", "INDIVIDUAL_DOCUMENT",
+))
+# Alias qualities kept as-is; anything else is kept only if it reads "good"
+# case-insensitively, which spares a lower() call for the usual spellings
+_ACCEPTED_ALIAS_QUALITIES = frozenset(("Good", "good", "GOOD", ""))
+_COMMENT_TAGS = tuple(f"COMMENTS{i}" for i in range(1, 6))
+_XP_VALUES = etree.XPath("VALUE/text()")
+
+# Precompiled lookups for the alias, date/place of birth, address and document children
+_XP_ALIAS_NAME = etree.XPath("ALIAS_NAME/text()")
+_XP_QUALITY = etree.XPath("QUALITY/text()")
+_XP_DATE = etree.XPath("DATE/text()")
+_XP_YEAR = etree.XPath("YEAR/text()")
+_XP_STREET = etree.XPath("STREET/text()")
+_XP_CITY = etree.XPath("CITY/text()")
+_XP_STATE_PROVINCE = etree.XPath("STATE_PROVINCE/text()")
+_XP_ZIP_CODE = etree.XPath("ZIP_CODE/text()")
+_XP_COUNTRY = etree.XPath("COUNTRY/text()")
+_XP_NOTE = etree.XPath("NOTE/text()")
+_XP_TYPE_OF_DOCUMENT = etree.XPath("TYPE_OF_DOCUMENT/text()")
+_XP_NUMBER = etree.XPath("NUMBER/text()")
+_XP_ISSUING_COUNTRY = etree.XPath("ISSUING_COUNTRY/text()")
+
+# Dates in the UN list are almost always already YYYY-MM-DD
+_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
 
 def clean_text(text: str) -> str:
     """Clean and normalize text by removing extra whitespace and normalizing unicode."""
-    if not text or pd.isna(text):
+    if not text:
         return ''
     
-    # Convert to string and normalize unicode
-    text = str(text)
-    text = unicodedata.normalize('NFKC', text)
-    
-    # Remove extra whitespace and newlines
-    text = ' '.join(text.split())
+    # Fast path: clean ASCII needs neither NFKC nor whitespace collapsing
+    if text.isascii() and not _UNCLEAN_WS.search(text):
+        return text.strip()
     
-    return text.strip()
+    # Normalize unicode, then collapse whitespace runs and newlines
+    text = unicodedata.normalize('NFKC', text)
+    return _WS.sub(' ', text).strip()
 
-def extract_text(element, tag: str, default: str = "") -> str:
+def xpath_text(xpath: etree.XPath, element, default: str = "") -> str:
     """
-    Extract text from XML element, return default if not found.
+    Extract text using a precompiled XPath, return default if not found.
     
     Args:
-        element: XML element to search within
-        tag: Tag name to find
+        xpath: Compiled XPath selecting the text nodes of a child tag
+        element: XML element to evaluate the XPath against
         default: Default value if tag not found or empty
         
     Returns:
-        Cleaned text content of the tag or default value
+        Cleaned text content of the first match or default value
     """
-    try:
-        found = element.find(tag)
-        if found is not None and found.text:
-            return clean_text(found.text)
-    except Exception as e:
-        logger.warning(f"Error extracting text for tag '{tag}': {e}")
-    return default
+    values = xpath(element)
+    return clean_text(values[0]) if values else default
+
+
+def sweep_children(element) -> Tuple[Dict[str, Optional[str]], Dict[str, List[Any]]]:
+    """
+    Read an element's direct children in a single pass.
+    
+    Args:
+        element: XML element whose children to read
+        
+    Returns:
+        Tuple of (texts, groups): the raw text of the first child with text
+        for each tag, and the child elements of each tag in _GROUPED_CHILD_TAGS
+    """
+    texts = {}
+    groups = {}
+    for child in element:
+        tag = child.tag
+        if tag in _GROUPED_CHILD_TAGS:
+            groups.setdefault(tag, []).append(child)
+        elif texts.get(tag) is None:
+            texts[tag] = child.text
+    return texts, groups
 
 
-def extract_value_list(element, tag: str) -> List[str]:
+def extract_value_list(xpath: etree.XPath, element) -> List[str]:
     """
-    Extract all VALUE elements from a tag.
+    Extract all VALUE texts selected by a precompiled XPath.
     
     Args:
-        element: XML element to search within
-        tag: Tag name to find
+        xpath: Compiled XPath selecting the VALUE text nodes of a tag
+        element: XML element to evaluate the XPath against
         
     Returns:
         List of cleaned text values
     """
-    values = []
-    try:
-        parent = element.find(tag)
-        if parent is not None:
-            for value_elem in parent.findall("VALUE"):
-                if value_elem.text:
-                    values.append(clean_text(value_elem.text))
-    except Exception as e:
-        logger.warning(f"Error extracting value list for tag '{tag}': {e}")
+    return [clean_text(value) for value in xpath(element)]
+
+
+def open_csv_output(path: Path) -> TextIO:
+    """
+    Open a CSV output file for writing with a large write buffer.
     
-    return values
+    Args:
+        path: Path to the output file
+        
+    Returns:
+        Text file object ready for csv/pandas writers
+    """
+    return open(path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
 
 
-def extract_all_children_text(element, tag: str) -> List[str]:
+def normalize_date(date_str: str) -> Optional[str]:
     """
-    Extract text from all child elements with given tag.
+    Return a date string in YYYY-MM-DD format.
+    
+    Well-formed ISO dates are only checked with date.fromisoformat and
+    returned as-is; other spellings (e.g. unpadded months) and shapes that
+    fail that check go through strptime.
     
     Args:
-        element: XML element to search within
-        tag: Tag name to find
+        date_str: Date string to normalize
         
     Returns:
-        List of cleaned text values from matching child elements
+        Normalized date string, or None if it is not a valid date
     """
-    values = []
+    if _ISO_DATE.match(date_str):
+        try:
+            date.fromisoformat(date_str)
+            return date_str
+        except ValueError:
+            pass  # e.g. 2020-13-45; let strptime reject it
     try:
-        for child in element.findall(tag):
-            if child.text:
-                values.append(clean_text(child.text))
-    except Exception as e:
-        logger.warning(f"Error extracting children text for tag '{tag}': {e}")
-    
-    return values
+        return datetime.strptime(date_str, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        return None
 
 
 def join_list(items: List[str], separator: str = "; ") -> str:
@@ -124,7 +208,68 @@ def join_list(items: List[str], separator: str = "; ") -> str:
     return separator.join(filter(None, [str(item).strip() for item in items]))
 
 
-def parse_individual(individual_elem, source: str, source_file: str) -> Dict[str, str]:
+def format_address(addr_elem) -> str:
+    """
+    Format an INDIVIDUAL_ADDRESS element as a single uppercase string.
+    
+    Args:
+        addr_elem: INDIVIDUAL_ADDRESS element
+        
+    Returns:
+        Comma-separated address, or empty string if it has no parts
+    """
+    street = xpath_text(_XP_STREET, addr_elem)
+    city = xpath_text(_XP_CITY, addr_elem)
+    state = xpath_text(_XP_STATE_PROVINCE, addr_elem)
+    postal_code = xpath_text(_XP_ZIP_CODE, addr_elem)
+    country = xpath_text(_XP_COUNTRY, addr_elem)
+    note = xpath_text(_XP_NOTE, addr_elem)
+    
+    # Build address string
+    addr_parts = []
+    if street:
+        addr_parts.append(street.upper())
+    if city:
+        addr_parts.append(city.upper())
+    if state:
+        addr_parts.append(state.upper())
+    if postal_code:
+        addr_parts.append(postal_code)
+    if country:
+        addr_parts.append(country.upper())
+    if note:
+        addr_parts.append(f"({note.upper()})")
+    
+    return ", ".join(addr_parts)
+
+
+def format_document(doc_elem) -> str:
+    """
+    Format an INDIVIDUAL_DOCUMENT element as "TYPE: NUMBER (COUNTRY)".
+    
+    Args:
+        doc_elem: INDIVIDUAL_DOCUMENT element
+        
+    Returns:
+        Formatted document, or empty string if it has no number
+    """
+    doc_number = xpath_text(_XP_NUMBER, doc_elem)
+    if not doc_number:
+        return ""
+    
+    doc_type = xpath_text(_XP_TYPE_OF_DOCUMENT, doc_elem)
+    issuing_country = xpath_text(_XP_ISSUING_COUNTRY, doc_elem)
+    
+    doc_info = doc_number.upper()
+    if doc_type:
+        doc_info = f"{doc_type.upper()}: {doc_info}"
+    if issuing_country:
+        doc_info = f"{doc_info} ({issuing_country.upper()})"
+    return doc_info
+
+
+def parse_individual(individual_elem, source: str, source_file: str,
+                     processing_date: str) -> Optional[Tuple[str, ...]]:
     """
     Parse an INDIVIDUAL element and return comprehensive record.
     
@@ -132,167 +277,108 @@ def parse_individual(individual_elem, source: str, source_file: str) -> Dict[str
         individual_elem: XML element containing individual data
         source: Source identifier (e.g., "UN")
         source_file: Source file name
+        processing_date: ISO date of this conversion run
         
     Returns:
-        Dictionary with all extracted fields
+        Tuple of field values in COLUMN_ORDER, or None if parsing failed
     """
     try:
+        # One pass over the children instead of a lookup per field
+        texts, groups = sweep_children(individual_elem)
+        
+        def text(tag: str) -> str:
+            return clean_text(texts.get(tag))
+        
+        def first_values(tag: str) -> List[str]:
+            elems = groups.get(tag)
+            return extract_value_list(_XP_VALUES, elems[0]) if elems else []
+        
         # Basic identifiers
-        dataid = extract_text(individual_elem, "DATAID").strip()
-        reference_number = extract_text(individual_elem, "REFERENCE_NUMBER").strip()
-        
-        # Name components
-        first_name = extract_text(individual_elem, "FIRST_NAME")
-        second_name = extract_text(individual_elem, "SECOND_NAME")
-        third_name = extract_text(individual_elem, "THIRD_NAME", "")  # May not exist
-        fourth_name = extract_text(individual_elem, "FOURTH_NAME", "")  # May not exist
-        
-        # Build full name from components
-        name_parts = [first_name, second_name, third_name, fourth_name]
-        name = " ".join(filter(None, name_parts)).strip()
-        
-        # If name is empty, try to get it from the title
-        if not name:
-            name = extract_text(individual_elem, "TITLE")
-        
-        # Normalize name to uppercase
-        name = name.upper() if name else ""
-        
-        # Aliases - collect all "Good" quality aliases
-        aliases = []
-        alias_elems = individual_elem.findall("INDIVIDUAL_ALIAS")
-        for alias_elem in alias_elems:
-            try:
-                alias_name = extract_text(alias_elem, "ALIAS_NAME")
-                quality = extract_text(alias_elem, "QUALITY", "").lower()
-                # Include "Good" quality or aliases without quality specified
-                if alias_name and (quality == "good" or quality == ""):
-                    aliases.append(alias_name.upper())
-            except Exception as e:
-                logger.warning(f"Error processing alias for {dataid}: {e}")
-    
-        # Gender
-        gender = extract_text(individual_elem, "GENDER")
+        dataid = text("DATAID")
+        reference_number = text("REFERENCE_NUMBER")
+        
+        # Name components, normalized to uppercase once here
+        first_name = text("FIRST_NAME").upper()
+        second_name = text("SECOND_NAME").upper()
+        third_name = text("THIRD_NAME").upper()  # May not exist
+        fourth_name = text("FOURTH_NAME").upper()  # May not exist
+        
+        # Build full name from components (already cleaned, so no strip needed);
+        # if there are none, try to get it from the title
+        name = (" ".join([part for part in (first_name, second_name, third_name, fourth_name) if part])
+                or text("TITLE").upper())
+        
+        # Aliases - collect all "Good" quality aliases, or aliases without
+        # quality specified. Items joined below are already cleaned and
+        # non-empty, so they go straight to str.join instead of join_list
+        aliases_str = "; ".join(
+            alias_name.upper()
+            for alias_name, quality in (
+                (xpath_text(_XP_ALIAS_NAME, alias_elem), xpath_text(_XP_QUALITY, alias_elem))
+                for alias_elem in groups.get("INDIVIDUAL_ALIAS", ())
+            )
+            if alias_name and (quality in _ACCEPTED_ALIAS_QUALITIES or quality.lower() == "good")
+        )
+    
+        # Gender, nationalities, list type and UN list type only take a handful
+        # of distinct values across the list; interning them lets the rows
+        # share one string each, which also shrinks the pickled batches sent
+        # back from parser processes
+        gender = sys.intern(text("GENDER").upper())
         
         # Nationalities (can have multiple)
-        nationality_values = extract_value_list(individual_elem, "NATIONALITY")
-        nationalities = join_list(nationality_values)
+        nationality_values = first_values("NATIONALITY")
+        nationalities = sys.intern(join_list([value.upper() for value in nationality_values]))
     
         # Date of birth - can have multiple entries
         dob_dates = []
         dob_years = []
-        dob_elems = individual_elem.findall("INDIVIDUAL_DATE_OF_BIRTH")
-        for dob_elem in dob_elems:
-            try:
-                # Check for full DATE field first
-                date_str = extract_text(dob_elem, "DATE")
-                if date_str:
-                    # Try to standardize date format
-                    try:
-                        # Try to parse and reformat the date
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                        date_str = date_obj.strftime('%Y-%m-%d')
-                    except ValueError:
-                        pass  # Keep original format if parsing fails
-                    dob_dates.append(date_str)
-                else:
-                    # Otherwise try YEAR
-                    year = extract_text(dob_elem, "YEAR")
-                    if year and year.isdigit() and len(year) == 4:
-                        dob_years.append(year)
-            except Exception as e:
-                logger.warning(f"Error processing DOB for {dataid}: {e}")
-        
-        dob_dates_str = join_list(dob_dates)
-        dob_years_str = join_list(dob_years)
+        for dob_elem in groups.get("INDIVIDUAL_DATE_OF_BIRTH", ()):
+            # Check for full DATE field first
+            date_str = xpath_text(_XP_DATE, dob_elem)
+            if date_str:
+                # Standardize date format, keep original if parsing fails
+                dob_dates.append(normalize_date(date_str) or date_str)
+            else:
+                # Otherwise try YEAR
+                year = xpath_text(_XP_YEAR, dob_elem)
+                if year and year.isdigit() and len(year) == 4:
+                    dob_years.append(year)
+        
+        dob_dates_str = "; ".join(dob_dates)
+        dob_years_str = "; ".join(dob_years)
     
         # Place of birth - can have multiple entries
-        pob_cities = []
-        pob_countries = []
-        pob_elems = individual_elem.findall("INDIVIDUAL_PLACE_OF_BIRTH")
-        for pob_elem in pob_elems:
-            try:
-                city = extract_text(pob_elem, "CITY")
-                country = extract_text(pob_elem, "COUNTRY")
-                if city:
-                    pob_cities.append(city.upper())
-                if country:
-                    pob_countries.append(country.upper())
-            except Exception as e:
-                logger.warning(f"Error processing place of birth for {dataid}: {e}")
-        
-        pob_cities_str = join_list(pob_cities)
-        pob_countries_str = join_list(pob_countries)
-    
-        # Addresses - can have multiple entries
-        addresses = []
-        address_elems = individual_elem.findall("INDIVIDUAL_ADDRESS")
-        for addr_elem in address_elems:
-            try:
-                street = extract_text(addr_elem, "STREET")
-                city = extract_text(addr_elem, "CITY")
-                state = extract_text(addr_elem, "STATE_PROVINCE")
-                postal_code = extract_text(addr_elem, "ZIP_CODE")
-                country = extract_text(addr_elem, "COUNTRY")
-                note = extract_text(addr_elem, "NOTE")
-                
-                # Build address string
-                addr_parts = []
-                if street:
-                    addr_parts.append(street.upper())
-                if city:
-                    addr_parts.append(city.upper())
-                if state:
-                    addr_parts.append(state.upper())
-                if postal_code:
-                    addr_parts.append(postal_code)
-                if country:
-                    addr_parts.append(country.upper())
-                if note:
-                    addr_parts.append(f"({note.upper()})")
-                
-                if addr_parts:
-                    addresses.append(", ".join(addr_parts))
-            except Exception as e:
-                logger.warning(f"Error processing address for {dataid}: {e}")
-        
-        addresses_str = join_list(addresses)
-    
-        # Documents - can have multiple entries
-        id_numbers = []
-        doc_elems = individual_elem.findall("INDIVIDUAL_DOCUMENT")
-        for doc_elem in doc_elems:
-            try:
-                doc_type = extract_text(doc_elem, "TYPE_OF_DOCUMENT")
-                doc_number = extract_text(doc_elem, "NUMBER")
-                issuing_country = extract_text(doc_elem, "ISSUING_COUNTRY")
-                
-                if doc_number:
-                    doc_info = doc_number.upper()
-                    if doc_type:
-                        doc_info = f"{doc_type.upper()}: {doc_info}"
-                    if issuing_country:
-                        doc_info = f"{doc_info} ({issuing_country.upper()})"
-                    id_numbers.append(doc_info)
-            except Exception as e:
-                logger.warning(f"Error processing document for {dataid}: {e}")
-        
-        id_numbers_str = join_list(id_numbers)
+        pob_elems = groups.get("INDIVIDUAL_PLACE_OF_BIRTH", ())
+        pob_cities_str = "; ".join(
+            city.upper() for city in (xpath_text(_XP_CITY, pob_elem) for pob_elem in pob_elems) if city
+        )
+        pob_countries_str = "; ".join(
+            country.upper() for country in (xpath_text(_XP_COUNTRY, pob_elem) for pob_elem in pob_elems) if country
+        )
+    
+        # Addresses and documents - can have multiple entries
+        addresses_str = "; ".join(
+            address for address in map(format_address, groups.get("INDIVIDUAL_ADDRESS", ())) if address
+        )
+        id_numbers_str = "; ".join(
+            doc_info for doc_info in map(format_document, groups.get("INDIVIDUAL_DOCUMENT", ())) if doc_info
+        )
     
         # UN List Type and Program
-        un_list_type = extract_text(individual_elem, "UN_LIST_TYPE")
+        un_list_type = sys.intern(text("UN_LIST_TYPE"))
         
         # List Type
-        list_type_values = extract_value_list(individual_elem, "LIST_TYPE")
-        list_type = join_list(list_type_values)
+        list_type_values = first_values("LIST_TYPE")
+        list_type = sys.intern(join_list(list_type_values))
         
         # Program (use UN_LIST_TYPE if no separate program field)
         program = un_list_type  # Can be enhanced if PROGRAM field exists
         
         # Comments/Narrative - combine all available comment fields
         comments_parts = []
-        for i in range(1, 6):  # Check COMMENTS1 through COMMENTS5
-            comment = extract_text(individual_elem, f"COMMENTS{i}", "").strip()
+        for comment_tag in _COMMENT_TAGS:  # Check COMMENTS1 through COMMENTS5
+            comment = text(comment_tag)
             if comment:
                 comments_parts.append(comment)
         
@@ -300,116 +386,183 @@ def parse_individual(individual_elem, source: str, source_file: str) -> Dict[str
         
         # Listed on date - try to standardize format
         listed_on = ""
-        listed_on_raw = extract_text(individual_elem, "LISTED_ON")
+        listed_on_raw = text("LISTED_ON")
         if listed_on_raw:
-            try:
-                # Try to parse and reformat the date
-                date_obj = datetime.strptime(listed_on_raw, '%Y-%m-%d')
-                listed_on = date_obj.strftime('%Y-%m-%d')
-            except ValueError:
-                listed_on = listed_on_raw  # Keep original if parsing fails
+            listed_on = normalize_date(listed_on_raw) or listed_on_raw
         
         # Last updated - get the most recent date
         last_updated = ""
-        last_updated_values = extract_value_list(individual_elem, "LAST_DAY_UPDATED")
+        last_updated_values = first_values("LAST_DAY_UPDATED")
         if last_updated_values:
-            try:
-                # Get the most recent date
-                dates = []
-                for date_str in last_updated_values:
-                    try:
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                        dates.append((date_obj, date_str))
-                    except ValueError:
-                        continue
-                
-                if dates:
-                    # Sort by date (newest first) and take the first one
-                    dates.sort(reverse=True, key=lambda x: x[0])
-                    last_updated = dates[0][1]
-            except Exception as e:
-                logger.warning(f"Error processing last_updated for {dataid}: {e}")
-                last_updated = last_updated_values[0]  # Fallback to first value
-    
-        # Build record with all fields
-        record = {
-            "source": source,
-            "source_file": source_file,
-            "record_type": "individual",
-            "dataid": dataid,
-            "reference_number": reference_number,
-            "name": name,
-            "first_name": first_name.upper() if first_name else "",
-            "middle_name": third_name.upper() if third_name else "",  # Using third_name as middle_name
-            "last_name": second_name.upper() if second_name else "",
-            "aliases": join_list(aliases),
-            "gender": gender.upper() if gender else "",
-            "nationalities": nationalities.upper() if nationalities else "",
-            "pob_cities": pob_cities_str,
-            "pob_countries": pob_countries_str,
-            "dob_dates": dob_dates_str,
-            "dob_years": dob_years_str,
-            "un_list_type": un_list_type,
-            "list_type": list_type,
-            "program": program,
-            "comments": comments,
-            "listed_on": listed_on,
-            "last_updated": last_updated,
-            "addresses": addresses_str,
-            "id_numbers": id_numbers_str,
-            "processing_date": date.today().isoformat()
-        }
-        
-        return record
+            # Get the most recent date; ISO dates sort correctly as strings
+            dates = [d for d in map(normalize_date, last_updated_values) if d]
+            if dates:
+                last_updated = max(dates)
+    
+        # Build row in COLUMN_ORDER
+        return (
+            source,
+            source_file,
+            dataid,
+            reference_number,
+            list_type,
+            "individual",
+            name,
+            first_name,
+            third_name,  # Using third_name as middle_name
+            second_name,
+            aliases_str,
+            nationalities,
+            gender,
+            pob_cities_str,
+            pob_countries_str,
+            dob_dates_str,
+            dob_years_str,
+            addresses_str,
+            id_numbers_str,
+            program,
+            comments,
+            listed_on,
+            last_updated,
+            processing_date,
+            un_list_type,
+        )
         
     except Exception as e:
         logger.error(f"Error parsing individual record: {e}", exc_info=True)
         return None
 
 
-def save_output(df: pd.DataFrame, output_path: Path) -> None:
+def parse_individual_batch(batch: List[bytes], source: str, source_file: str,
+                           processing_date: str) -> List[Tuple[str, ...]]:
     """
-    Save the DataFrame to a CSV file with proper formatting.
+    Parse a batch of serialized INDIVIDUAL elements (worker process entry point).
     
     Args:
-        df: DataFrame to save
-        output_path: Path to save the file to
+        batch: Serialized INDIVIDUAL elements
+        source: Source identifier (e.g., "UN")
+        source_file: Source file name
+        processing_date: ISO date of this conversion run
+        
+    Returns:
+        Rows in COLUMN_ORDER for every element that parsed successfully
     """
-    try:
-        # Ensure the output directory exists
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Build save arguments
-        save_args = {
-            'path_or_buf': output_path,
-            'index': False,
-            'encoding': 'utf-8',
-            'quoting': 1,  # Quote all fields
-            'quotechar': '"',
-            'escapechar': '\\',
-            'date_format': '%Y-%m-%d'
-        }
-        
-        # Check pandas version to handle line_terminator parameter
-        import pandas as pd
-        if pd.__version__ < '2.0.0':
-            save_args['line_terminator'] = '\n'
-        # Save the DataFrame
-        df.to_csv(**save_args)
-        logger.info(f"Successfully saved output to {output_path}")
+    rows = []
+    for raw in batch:
+        row = parse_individual(etree.fromstring(raw), source, source_file, processing_date)
+        if row is not None:
+            rows.append(row)
+    return rows
+
+
+def iter_individuals(xml_path: Path) -> Iterator[Any]:
+    """
+    Stream INDIVIDUAL elements from the XML file.
+    
+    Each element is cleared, and detached from its parent, as soon as the
+    caller moves on to the next one, so only one record is held in memory.
+    
+    Args:
+        xml_path: Path to input XML file
         
-    except Exception as e:
-        logger.error(f"Error saving output file {output_path}: {e}")
-        raise
+    Yields:
+        INDIVIDUAL elements in document order
+    """
+    for _, individual in etree.iterparse(str(xml_path), events=("end",), tag="INDIVIDUAL"):
+        yield individual
+        individual.clear()
+        while individual.getprevious() is not None:
+            del individual.getparent()[0]
+
+
+def default_workers() -> int:
+    """
+    Number of parser processes to use when the caller doesn't say.
+    
+    Inside another process pool (run_all_conversions.py runs each converter
+    in its own worker) a nested pool would only compete with the sibling
+    converters for the same CPUs, so parse in-process there. Otherwise use
+    every CPU, or at most UN_PARSE_WORKERS when it is set.
+    """
+    if multiprocessing.parent_process() is not None:
+        return 1
+    workers = os.cpu_count() or 1
+    cap = os.environ.get(PARSE_WORKERS_ENV)
+    if cap:
+        try:
+            workers = min(workers, max(int(cap), 1))
+        except ValueError:
+            logger.warning(f"Ignoring invalid {PARSE_WORKERS_ENV}={cap!r}")
+    return workers
+
 
-def convert_xml_to_csv(xml_path: Path, output_dir: Path, source: str = "UN") -> Tuple[Path, int]:
+def iter_parsed_rows(individuals: Iterator[Any], source: str, source_file: str,
+                     processing_date: str, workers: int) -> Iterator[Tuple[str, ...]]:
+    """
+    Yield parsed rows in document order.
+    
+    With more than one worker, INDIVIDUAL elements are serialized in batches
+    of PARSE_BATCH_SIZE and parsed in a process pool, with at most two
+    batches per worker in flight so memory stays bounded; inputs smaller
+    than one batch are parsed in-process since the pool start-up would cost
+    more than it saves.
+    
+    Args:
+        individuals: INDIVIDUAL elements to parse
+        source: Source identifier (e.g., "UN")
+        source_file: Source file name
+        processing_date: ISO date of this conversion run
+        workers: Number of worker processes
+        
+    Yields:
+        Rows in COLUMN_ORDER for every element that parsed successfully
+    """
+    if workers <= 1:
+        for individual in individuals:
+            row = parse_individual(individual, source, source_file, processing_date)
+            if row is not None:
+                yield row
+        return
+    
+    def serialize(batch_size: int) -> List[bytes]:
+        return [etree.tostring(elem, with_tail=False) for elem in islice(individuals, batch_size)]
+    
+    parse_batch = partial(parse_individual_batch, source=source, source_file=source_file,
+                          processing_date=processing_date)
+    first_batch = serialize(PARSE_BATCH_SIZE)
+    if len(first_batch) < PARSE_BATCH_SIZE:
+        yield from parse_batch(first_batch)
+        return
+    
+    batches = chain([first_batch], iter(lambda: serialize(PARSE_BATCH_SIZE), []))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Keep only a few batches in flight, rather than letting map() read
+        # and submit the whole file up front; results are taken oldest first,
+        # keeping the output in document order
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(parse_batch, batch))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def convert_xml_to_csv(xml_path: Path, output_dir: Path, source: str = "UN",
+                       workers: Optional[int] = None) -> Tuple[Path, int]:
     """
     Convert UN sanctions XML file to CSV with standardized format.
     
+    The XML is streamed with iterparse and records are written to the CSV
+    as soon as they are parsed, so memory use does not grow with the file.
+    
     Args:
         xml_path: Path to input XML file
         output_dir: Directory to save output CSV files
         source: Source identifier (e.g., "UN")
+        workers: Number of parser processes (defaults to the CPU count, or to
+            parsing in-process when already running in a worker process,
+            e.g. under run_all_conversions.py)
         
     Returns:
         Tuple of (output_path, record_count)
@@ -418,85 +571,83 @@ def convert_xml_to_csv(xml_path: Path, output_dir: Path, source: str = "UN") ->
     logger.info(f"Parsing XML file: {xml_path}")
     source_file = xml_path.name
     
+    tmp_path = None
     try:
-        # Parse XML
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-        
-        # Find all INDIVIDUAL elements
-        individuals = root.findall(".//INDIVIDUAL")
-        logger.info(f"Found {len(individuals)} individuals in XML")
-        
-        # Parse all individuals
-        all_records = []
-        for idx, individual in enumerate(individuals):
-            if (idx + 1) % 1000 == 0:
-                logger.info(f"  Processed {idx + 1}/{len(individuals)} individuals...")
-            
-            record = parse_individual(individual, source, source_file)
-            if record:  # Only add if parsing was successful
-                all_records.append(record)
-        
-        if not all_records:
-            logger.error("No valid records were generated")
-            return None, 0
-        
-        # Create DataFrame
-        df = pd.DataFrame(all_records)
-        
-        # Reorder columns to match other sanctions lists
-        column_order = [
-            'source', 'source_file', 'dataid', 'reference_number', 'list_type',
-            'record_type', 'name', 'first_name', 'middle_name', 'last_name',
-            'aliases', 'nationalities', 'gender', 'pob_cities', 'pob_countries',
-            'dob_dates', 'dob_years', 'addresses', 'id_numbers', 'program',
-            'comments', 'listed_on', 'last_updated', 'processing_date', 'un_list_type'
-        ]
-        
-        # Only include columns that exist in the DataFrame
-        existing_columns = [col for col in column_order if col in df.columns]
-        df = df[existing_columns]
-        
         # Create date-based filename
         today = date.today().strftime('%Y%m%d')
         output_filename = f"un_sanctions_{today}.csv"
         output_path = output_dir / output_filename
         latest_path = output_dir / "un_sanctions_latest.csv"
+        tmp_path = output_path.with_name(output_filename + ".tmp")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Parse and write all individuals in a single pass
+        record_count = 0
+        type_counts = Counter()
+        sample_rows = []
+        record_type_idx = COLUMN_ORDER.index('record_type')
+        with open_csv_output(tmp_path) as csvfile:
+            # escapechar keeps backslashes intact for combine_sanctions.py's reader
+            writer = csv.writer(csvfile, quoting=csv.QUOTE_MINIMAL, escapechar='\\', lineterminator='\n')
+            writer.writerow(COLUMN_ORDER)
+            processing_date = date.today().isoformat()
+            rows = iter_parsed_rows(iter_individuals(xml_path), source, source_file,
+                                    processing_date, workers or default_workers())
+            batch = []
+            for row in rows:
+                batch.append(row)
+                record_count += 1
+                if record_count % 1000 == 0:
+                    logger.info(f"  Processed {record_count} individuals...")
+                type_counts[row[record_type_idx]] += 1
+                if len(sample_rows) < 3:
+                    sample_rows.append(dict(zip(COLUMN_ORDER, row)))
+                if len(batch) == WRITE_BATCH_SIZE:
+                    writer.writerows(batch)
+                    batch.clear()
+            writer.writerows(batch)
+        
+        if not record_count:
+            tmp_path.unlink()
+            logger.error("No valid records were generated")
+            return None, 0
         
-        # Save the data
-        save_output(df, output_path)
+        os.replace(tmp_path, output_path)
+        logger.info(f"Successfully saved output to {output_path}")
         
-        # Create/update the latest symlink
+        # Create/update the latest symlink atomically: link under a temp
+        # name, then rename over the old link so it never goes missing
         try:
-            if latest_path.exists():
-                latest_path.unlink()
-            latest_path.symlink_to(output_path.name)
+            tmp_link = latest_path.with_name(latest_path.name + ".tmp")
+            tmp_link.unlink(missing_ok=True)
+            os.symlink(output_path.name, tmp_link)
+            os.replace(tmp_link, latest_path)
             logger.info(f"Created symlink: {latest_path} -> {output_path.name}")
         except OSError as e:
             logger.warning(f"Could not create symlink: {e}")
         
         # Log statistics
         duration = (datetime.now() - start_time).total_seconds()
-        logger.info(f"Processed {len(df)} records in {duration:.2f} seconds")
+        logger.info(f"Processed {record_count} records in {duration:.2f} seconds")
         
         # Additional statistics
-        if 'record_type' in df.columns:
-            type_counts = df['record_type'].value_counts().to_dict()
-            logger.info("Record type distribution:")
-            for rec_type, count in type_counts.items():
-                logger.info(f"  {rec_type}: {count} records")
+        logger.info("Record type distribution:")
+        for rec_type, count in type_counts.most_common():
+            logger.info(f"  {rec_type}: {count} records")
         
         # Show sample records
         logger.info("\nSample records:")
-        for _, row in df.head(3).iterrows():
+        for row in sample_rows:
             logger.info(f"\n  Name: {row.get('name', 'N/A')}")
             logger.info(f"  Type: {row.get('record_type', 'N/A')}")
             logger.info(f"  Nationalities: {row.get('nationalities', 'N/A')}")
             logger.info(f"  Program: {row.get('program', 'N/A')}")
         
-        return output_path, len(df)
+        return output_path, record_count
         
     except Exception as e:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
         logger.error(f"Error processing XML file: {e}", exc_info=True)
         return None, 0
 
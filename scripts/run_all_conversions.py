@@ -1,24 +1,35 @@
 #!/usr/bin/env python3
 """
-Run all conversion scripts in sequence.
+Run all conversion scripts concurrently.
 """
-import subprocess
+import importlib
 import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Tuple
 
-def run_script(script_path: str) -> Tuple[bool, str]:
-    """Run a Python script and return success status and output."""
+def run_converter(module_name: str) -> Tuple[bool, str]:
+    """
+    Import a converter module and call its main() in this process.
+
+    Runs inside a worker process, so each converter keeps its own logging
+    setup and module state, without paying for a fresh interpreter.
+
+    Returns:
+        Tuple of (success, error output)
+    """
     try:
-        result = subprocess.run(
-            [sys.executable, script_path],
-            check=True,
-            capture_output=True,
-            text=True
-        )
-        return True, result.stdout
-    except subprocess.CalledProcessError as e:
-        return False, e.stderr
+        module = importlib.import_module(module_name)
+        exit_code = module.main()
+    except SystemExit as e:
+        exit_code = e.code
+    except Exception:
+        return False, traceback.format_exc()
+
+    if exit_code in (0, None):
+        return True, ""
+    return False, f"main() returned exit code {exit_code}"
 
 def main():
     script_dir = Path(__file__).parent
@@ -29,24 +40,39 @@ def main():
         script_dir / 'convert_un_to_csv.py'
     ]
 
+    # Converters are imported by module name, so make sure they're importable
+    if str(script_dir) not in sys.path:
+        sys.path.insert(0, str(script_dir))
+
     print("Starting all conversion scripts...\n" + "="*50)
-    
+
+    existing = []
     for script in scripts:
         if not script.exists():
             print(f"⚠️  Script not found: {script}")
             continue
-            
-        print(f"\n🚀 Running {script.name}...")
-        success, output = run_script(str(script))
-        
-        if success:
-            print(f"✅ {script.name} completed successfully!")
-            if output.strip():
-                print(f"Output:\n{output}")
-        else:
-            print(f"❌ {script.name} failed!")
-            print(f"Error:\n{output}")
-    
+        existing.append(script)
+
+    # The converters read and write different files, so run them side by
+    # side. Each gets a fresh worker process: a worker reused for a second
+    # converter would keep the first one's logging handlers (making the
+    # second's basicConfig a no-op) and module state
+    with ProcessPoolExecutor(max_workers=max(len(existing), 1), max_tasks_per_child=1) as executor:
+        futures = {}
+        for script in existing:
+            print(f"\n🚀 Running {script.name}...")
+            futures[executor.submit(run_converter, script.stem)] = script
+
+        for future in as_completed(futures):
+            script = futures[future]
+            success, output = future.result()
+
+            if success:
+                print(f"✅ {script.name} completed successfully!")
+            else:
+                print(f"❌ {script.name} failed!")
+                print(f"Error:\n{output}")
+
     print("\n" + "="*50)
     print("All conversions completed!")
 
@@ -15,29 +15,32 @@ Requires Playwright for UK/EU downloads: pip install playwright && playwright in
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
 import sys
+import os
+import json
 import shutil
+import threading
+import time
+import argparse
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import BinaryIO, Dict, Optional, Tuple
 import subprocess
+import tempfile
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 try:
     from playwright.async_api import async_playwright
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('sanctions_update.log')
-    ]
-)
 logger = logging.getLogger(__name__)
 
 # Project paths
@@ -61,67 +64,268 @@ EU_SANCTIONS_URL = "https://data.europa.eu/data/datasets/consolidated-list-of-pe
 # User agent for downloads
 USER_AGENT = "Mozilla/5.0 (compatible; CorridorComply/1.0; +https://github.com/Zezoo123/CorridorComply)"
 
+# Block size for writing downloads to disk, and how often to log progress
+DOWNLOAD_BLOCK_SIZE = 1024 * 1024
+PROGRESS_INTERVAL_SECONDS = 2.0
+
+# How long a downloaded list is reused before it is fetched again, unless the
+# update is forced
+MAX_AGE_SECONDS = {
+    'un': 6 * 3600,
+    'ofac': 6 * 3600,
+    'uk': 24 * 3600,
+    'eu': 24 * 3600,
+}
+
+# Resource types the browser downloads skip loading
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+# Download selectors that worked on the last scrape, kept per source directory
+SELECTOR_CACHE_FILENAME = ".selector_cache.json"
+
+# ETag/Last-Modified of previous downloads, kept in RAW_DIR and keyed by URL
+HTTP_CACHE_FILENAME = ".http_cache.json"
+_HTTP_CACHE_LOCK = threading.Lock()
+
+
+def create_session() -> requests.Session:
+    """
+    Create the HTTP session shared by all downloads.
+    
+    Pooled keep-alive connections let the OFAC files, which share a host,
+    and any redirects reuse one TLS connection; transient errors are retried
+    with backoff.
+    """
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+SESSION = create_session()
+atexit.register(SESSION.close)
+
+
+def setup_logging() -> None:
+    """
+    Log to the console and sanctions_update.log.
+    
+    Downloads and conversions log from several threads at once, so records
+    are queued and written by a single listener thread instead of each
+    caller taking the handler locks.
+    """
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(
+        log_queue,
+        logging.StreamHandler(),
+        logging.FileHandler('sanctions_update.log')
+    )
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[QueueHandler(log_queue)]
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+
+def log_download_progress(f: BinaryIO, total_size: int, stop: threading.Event) -> None:
+    """
+    Log how much of a download has been written every few seconds until stopped.
+    
+    Progress is the write position in f rather than the file size, which is
+    the full length from the start when the file was preallocated.
+    """
+    while not stop.wait(PROGRESS_INTERVAL_SECONDS):
+        try:
+            downloaded = f.tell()
+        except (OSError, ValueError):
+            continue
+        if total_size > 0:
+            percent = (downloaded / total_size) * 100
+            logger.info(f"  Downloaded {downloaded / 1024 / 1024:.1f} MB ({percent:.1f}%)")
+        else:
+            logger.info(f"  Downloaded {downloaded / 1024 / 1024:.1f} MB")
+
+
+def is_fresh(path: Path, max_age_seconds: float) -> bool:
+    """Check whether a file exists and was written less than max_age_seconds ago."""
+    try:
+        return time.time() - path.stat().st_mtime < max_age_seconds
+    except OSError:
+        return False
+
+
+def find_fresh_file(directory: Path, pattern: str, max_age_seconds: float) -> Optional[Path]:
+    """Return the newest file in directory matching pattern, if it is still fresh."""
+    candidates = list(directory.glob(pattern))
+    if not candidates:
+        return None
+    latest = max(candidates, key=lambda f: f.stat().st_mtime)
+    return latest if is_fresh(latest, max_age_seconds) else None
+
+
+def load_cached_selector(cache_path: Path, source: str) -> Optional[str]:
+    """Return the download selector that last worked for a source, if any."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get(source)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def save_cached_selector(cache_path: Path, source: str, selector: str) -> None:
+    """Remember the download selector that worked for a source."""
+    try:
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({source: selector}, f)
+    except OSError as e:
+        logger.warning(f"Could not save selector cache {cache_path}: {e}")
+
+
+def load_http_cache() -> Dict[str, Dict[str, str]]:
+    """Load the validators saved for previous downloads, keyed by URL."""
+    try:
+        with open(RAW_DIR / HTTP_CACHE_FILENAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def update_http_cache(url: str, entry: Optional[Dict[str, str]]) -> None:
+    """Store (or, with entry=None, forget) the validators for a URL."""
+    with _HTTP_CACHE_LOCK:
+        cache = load_http_cache()
+        if entry:
+            cache[url] = entry
+        else:
+            cache.pop(url, None)
+        
+        cache_path = RAW_DIR / HTTP_CACHE_FILENAME
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, cache_path)
+
 
 def download_file(url: str, output_path: Path, timeout: int = 300) -> Tuple[bool, str]:
-    """Download a file from a URL."""
+    """
+    Download a file from a URL.
+    
+    The body is written to a temporary file next to output_path and renamed
+    over it once complete, so a failed download never leaves a partial file.
+    If output_path still holds the last download of this URL, the request is
+    made conditional on its ETag/Last-Modified, and a 304 reply keeps the
+    existing file instead of transferring it again.
+    """
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
     try:
         logger.info(f"Downloading from {url}...")
-        headers = {'User-Agent': USER_AGENT}
+        headers = {}
+        cached = load_http_cache().get(url, {})
+        if cached.get('path') == str(output_path) and output_path.exists():
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
         
-        response = requests.get(url, headers=headers, timeout=timeout, stream=True)
+        response = SESSION.get(url, headers=headers, timeout=timeout, stream=True)
+        if response.status_code == 304:
+            response.close()
+            output_path.touch()
+            logger.info(f"✅ {output_path.name} not modified since last download")
+            return True, "Not modified"
         response.raise_for_status()
         
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
+        # Content-Length counts the encoded body, but decoded bytes are what
+        # reach the file, so with a Content-Encoding the size is unknown
+        if 'content-encoding' in response.headers:
+            total_size = 0
+        else:
+            total_size = int(response.headers.get('content-length', 0))
         
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size > 0 and downloaded % (5 * 1024 * 1024) == 0:
-                        percent = (downloaded / total_size) * 100
-                        logger.info(f"  Downloaded {downloaded / 1024 / 1024:.1f} MB ({percent:.1f}%)")
+        # Copy the body in 1 MiB blocks without a Python-level loop per chunk;
+        # progress is reported from a side thread watching the write position
+        response.raw.decode_content = True
+        stop_progress = threading.Event()
+        with open(tmp_path, 'wb') as f:
+            # Reserve the whole file up front when its size is known, so it is
+            # laid out in one extent instead of growing write by write
+            if total_size > 0 and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(f.fileno(), 0, total_size)
+                except OSError:
+                    pass  # Not supported by this filesystem
+            progress = threading.Thread(
+                target=log_download_progress,
+                args=(f, total_size, stop_progress),
+                daemon=True
+            )
+            progress.start()
+            try:
+                shutil.copyfileobj(response.raw, f, length=DOWNLOAD_BLOCK_SIZE)
+            finally:
+                stop_progress.set()
+                progress.join()
+            # Never keep preallocated space past the end of what was written
+            f.truncate()
+        os.replace(tmp_path, output_path)
+        
+        validators = {
+            key: response.headers[header]
+            for key, header in (('etag', 'ETag'), ('last_modified', 'Last-Modified'))
+            if response.headers.get(header)
+        }
+        if validators:
+            update_http_cache(url, {'path': str(output_path), **validators})
         
         file_size = output_path.stat().st_size
         logger.info(f"✅ Downloaded {file_size / 1024 / 1024:.2f} MB to {output_path.name}")
         return True, f"Downloaded {file_size / 1024 / 1024:.2f} MB"
         
     except requests.exceptions.RequestException as e:
+        tmp_path.unlink(missing_ok=True)
         error_msg = f"Failed to download {url}: {str(e)}"
         logger.error(error_msg)
         return False, error_msg
     except Exception as e:
+        tmp_path.unlink(missing_ok=True)
         error_msg = f"Unexpected error downloading {url}: {str(e)}"
         logger.error(error_msg, exc_info=True)
         return False, error_msg
 
 
-def download_un_sanctions() -> Tuple[bool, Optional[Path]]:
-    """Download UN consolidated sanctions list."""
+def download_un_sanctions(force: bool = False) -> Tuple[bool, Optional[Path]]:
+    """Download UN consolidated sanctions list, unless a fresh copy exists and force is False."""
     output_dir = RAW_DIR / "un"
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    timestamp = datetime.now().strftime("%Y%m%d")
-    temp_path = output_dir / f"un_consolidated_{timestamp}.xml"
+    # Download straight to the filename the conversion script expects;
+    # download_file() swaps it in atomically once complete
+    expected_path = output_dir / "consolidatedLegacyByPRN.xml"
+    if not force and is_fresh(expected_path, MAX_AGE_SECONDS['un']):
+        logger.info(f"UN sanctions list is recent, skipping download: {expected_path.name}")
+        return True, expected_path
     
-    success, message = download_file(UN_URL, temp_path)
+    success, message = download_file(UN_URL, expected_path)
     if success:
-        # Rename to expected filename for conversion script
-        expected_path = output_dir / "consolidatedLegacyByPRN.xml"
-        if expected_path.exists():
-            expected_path.unlink()
-        shutil.move(temp_path, expected_path)
         logger.info(f"Saved as: {expected_path.name}")
         return True, expected_path
     
     return False, None
 
 
-def download_ofac_sanctions() -> Tuple[bool, list[Path]]:
-    """Download OFAC sanctions lists (SDN, ALT, ADD)."""
+def download_ofac_sanctions(force: bool = False) -> Tuple[bool, list[Path]]:
+    """Download OFAC sanctions lists (SDN, ALT, ADD), unless fresh copies exist and force is False."""
     output_dir = RAW_DIR / "ofac"
     output_dir.mkdir(parents=True, exist_ok=True)
     
@@ -133,36 +337,67 @@ def download_ofac_sanctions() -> Tuple[bool, list[Path]]:
         (OFAC_ADD_URL, "add.csv")
     ]
     
-    for url, filename in urls:
-        output_path = output_dir / filename
-        success, message = download_file(url, output_path)
+    output_paths = [output_dir / filename for _, filename in urls]
+    if not force and all(is_fresh(path, MAX_AGE_SECONDS['ofac']) for path in output_paths):
+        logger.info("OFAC sanctions lists are recent, skipping download")
+        return True, output_paths
+    
+    # All three files live on the same host, so fetch them side by side over
+    # the shared session's pooled connections
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        outcomes = list(executor.map(download_file, [url for url, _ in urls], output_paths))
+    
+    for output_path, (success, message) in zip(output_paths, outcomes):
         if success:
             downloaded_files.append(output_path)
         else:
-            logger.warning(f"Failed to download {filename}: {message}")
+            logger.warning(f"Failed to download {output_path.name}: {message}")
     
     if downloaded_files:
         return True, downloaded_files
     return False, []
 
 
-async def download_uk_sanctions_async() -> Tuple[bool, Optional[Path]]:
-    """Download UK sanctions file using Playwright."""
+async def skip_heavy_resources(route) -> None:
+    """
+    Playwright route handler that aborts images, fonts and media.
+    
+    None of them are needed to find and click a download link, and the
+    pages reach network idle much sooner without them. Stylesheets are
+    still loaded since they decide which links count as visible.
+    """
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def download_uk_sanctions_async(force: bool = False) -> Tuple[bool, Optional[Path]]:
+    """Download UK sanctions file using Playwright, unless a fresh copy exists and force is False."""
+    output_dir = RAW_DIR / "uk"
+    if not force and output_dir.exists():
+        fresh_file = find_fresh_file(output_dir, "uk_sanctions_*.csv", MAX_AGE_SECONDS['uk'])
+        if fresh_file:
+            logger.info(f"UK sanctions list is recent, skipping download: {fresh_file.name}")
+            return True, fresh_file
+    
     if not PLAYWRIGHT_AVAILABLE:
         logger.error("Playwright not available. Install with: pip install playwright && playwright install chromium")
         return False, None
     
-    output_dir = RAW_DIR / "uk"
     output_dir.mkdir(parents=True, exist_ok=True)
     
     try:
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
             context = await browser.new_context(accept_downloads=True)
+            await context.route("**/*", skip_heavy_resources)
             page = await context.new_page()
             
             logger.info(f"Navigating to {UK_SANCTIONS_URL}...")
-            await page.goto(UK_SANCTIONS_URL, wait_until="networkidle", timeout=30000)
+            # The download link is waited for explicitly below, so the DOM
+            # being ready is enough here
+            await page.goto(UK_SANCTIONS_URL, wait_until="domcontentloaded", timeout=30000)
             
             logger.info("Waiting for download link...")
             await page.wait_for_selector("a.app-download-link", timeout=30000)
@@ -191,28 +426,35 @@ async def download_uk_sanctions_async() -> Tuple[bool, Optional[Path]]:
         return False, None
 
 
-def download_uk_sanctions() -> Tuple[bool, Optional[Path]]:
+def download_uk_sanctions(force: bool = False) -> Tuple[bool, Optional[Path]]:
     """Download UK sanctions file (synchronous wrapper)."""
     try:
-        return asyncio.run(download_uk_sanctions_async())
+        return asyncio.run(download_uk_sanctions_async(force))
     except Exception as e:
         logger.error(f"Error in UK download: {str(e)}")
         return False, None
 
 
-async def download_eu_sanctions_async() -> Tuple[bool, Optional[Path]]:
-    """Download EU sanctions file using Playwright."""
+async def download_eu_sanctions_async(force: bool = False) -> Tuple[bool, Optional[Path]]:
+    """Download EU sanctions file using Playwright, unless a fresh copy exists and force is False."""
+    output_dir = RAW_DIR / "eu"
+    if not force and output_dir.exists():
+        fresh_file = find_fresh_file(output_dir, "eu_sanctions_FULL_*", MAX_AGE_SECONDS['eu'])
+        if fresh_file:
+            logger.info(f"EU sanctions list is recent, skipping download: {fresh_file.name}")
+            return True, fresh_file
+    
     if not PLAYWRIGHT_AVAILABLE:
         logger.error("Playwright not available. Install with: pip install playwright && playwright install chromium")
         return False, None
     
-    output_dir = RAW_DIR / "eu"
     output_dir.mkdir(parents=True, exist_ok=True)
     
     try:
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
             context = await browser.new_context(accept_downloads=True)
+            await context.route("**/*", skip_heavy_resources)
             page = await context.new_page()
             
             logger.info(f"Navigating to {EU_SANCTIONS_URL}...")
@@ -236,6 +478,14 @@ async def download_eu_sanctions_async() -> Tuple[bool, Optional[Path]]:
                 "[data-testid*='download']"
             ]
             
+            # Try the selector that worked last time first; a miss on each of
+            # the others costs a full wait_for_selector timeout
+            selector_cache_path = output_dir / SELECTOR_CACHE_FILENAME
+            cached_selector = load_cached_selector(selector_cache_path, 'eu')
+            if cached_selector in download_selectors:
+                download_selectors.remove(cached_selector)
+                download_selectors.insert(0, cached_selector)
+            
             download_clicked = False
             output_path = None
             timestamp = datetime.now().strftime("%Y%m%d")
@@ -243,7 +493,8 @@ async def download_eu_sanctions_async() -> Tuple[bool, Optional[Path]]:
             for selector in download_selectors:
                 try:
                     logger.info(f"Trying selector: {selector}")
-                    element = await page.wait_for_selector(selector, timeout=10000, state="visible")
+                    timeout = 5000 if selector == cached_selector else 10000
+                    element = await page.wait_for_selector(selector, timeout=timeout, state="visible")
                     if element:
                         # Check if it's a CSV or ZIP file
                         href = await element.get_attribute("href")
@@ -259,6 +510,8 @@ async def download_eu_sanctions_async() -> Tuple[bool, Optional[Path]]:
                             await download.save_as(output_path)
                             download_clicked = True
                             logger.info(f"Downloaded via selector: {selector}")
+                            if selector != cached_selector:
+                                save_cached_selector(selector_cache_path, 'eu', selector)
                             break
                 except Exception as e:
                     logger.debug(f"Selector {selector} failed: {str(e)}")
@@ -275,7 +528,7 @@ async def download_eu_sanctions_async() -> Tuple[bool, Optional[Path]]:
                         logger.info(f"Found direct link: {full_url}")
                         # Use requests to download directly
                         try:
-                            response = requests.get(full_url, timeout=300, stream=True)
+                            response = SESSION.get(full_url, timeout=300, stream=True)
                             response.raise_for_status()
                             output_path = output_dir / f"eu_sanctions_FULL_{timestamp}.csv"
                             if ".zip" in href.lower():
@@ -306,17 +559,17 @@ async def download_eu_sanctions_async() -> Tuple[bool, Optional[Path]]:
         return False, None
 
 
-def download_eu_sanctions() -> Tuple[bool, Optional[Path]]:
+def download_eu_sanctions(force: bool = False) -> Tuple[bool, Optional[Path]]:
     """Download EU sanctions file (synchronous wrapper)."""
     try:
-        return asyncio.run(download_eu_sanctions_async())
+        return asyncio.run(download_eu_sanctions_async(force))
     except Exception as e:
         logger.error(f"Error in EU download: {str(e)}")
         return False, None
 
 
-def run_conversion_script(script_name: str) -> bool:
-    """Run a conversion script."""
+def run_conversion_script(script_name: str, env: Optional[Dict[str, str]] = None) -> bool:
+    """Run a conversion script, with env added to its environment."""
     script_path = SCRIPT_DIR / script_name
     if not script_path.exists():
         logger.error(f"Conversion script not found: {script_path}")
@@ -324,23 +577,31 @@ def run_conversion_script(script_name: str) -> bool:
     
     logger.info(f"Running conversion: {script_name}...")
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=600
-        )
+        # Converters log a lot; spool stderr to a temp file rather than
+        # holding it in memory, and only read it back if the script fails
+        with tempfile.TemporaryFile() as stderr_file:
+            try:
+                subprocess.run(
+                    [sys.executable, str(script_path)],
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=stderr_file,
+                    env={**os.environ, 'PYTHONUNBUFFERED': '1', **(env or {})},
+                    timeout=600
+                )
+            except subprocess.CalledProcessError as e:
+                logger.error(f"❌ {script_name} failed with exit code {e.returncode}")
+                # The traceback is at the end of the output
+                stderr_file.seek(max(stderr_file.tell() - 500, 0))
+                error_tail = stderr_file.read().decode('utf-8', errors='replace')
+                if error_tail:
+                    logger.error(f"Error: {error_tail}")
+                return False
         logger.info(f"✅ {script_name} completed successfully")
         return True
     except subprocess.TimeoutExpired:
         logger.error(f"❌ {script_name} timed out after 10 minutes")
         return False
-    except subprocess.CalledProcessError as e:
-        logger.error(f"❌ {script_name} failed with exit code {e.returncode}")
-        if e.stderr:
-            logger.error(f"Error: {e.stderr[:500]}")
-        return False
     except Exception as e:
         logger.error(f"❌ Error running {script_name}: {str(e)}")
         return False
@@ -370,68 +631,59 @@ def update_sanctions_lists(force: bool = False) -> int:
     
     results = {'un': False, 'ofac': False, 'uk': False, 'eu': False}
     
-    # Download UN sanctions
+    # Download all four lists at once; each is bound by network I/O and they
+    # share nothing, so total time is the slowest download rather than the sum.
+    # UK and EU each drive Playwright through asyncio.run() on their own thread
     logger.info("\n" + "-"*70)
-    logger.info("1. Downloading UN Sanctions")
+    logger.info("1. Downloading UN, OFAC, UK and EU Sanctions")
     logger.info("-"*70)
-    un_success, un_file = download_un_sanctions()
-    results['un'] = un_success
-    
-    # Download OFAC sanctions
-    logger.info("\n" + "-"*70)
-    logger.info("2. Downloading OFAC Sanctions")
-    logger.info("-"*70)
-    ofac_success, ofac_files = download_ofac_sanctions()
-    results['ofac'] = ofac_success
-    
-    # Download UK sanctions
-    logger.info("\n" + "-"*70)
-    logger.info("3. Downloading UK Sanctions")
-    logger.info("-"*70)
-    uk_success, uk_file = download_uk_sanctions()
-    results['uk'] = uk_success
-    
-    # Download EU sanctions
-    logger.info("\n" + "-"*70)
-    logger.info("4. Downloading EU Sanctions")
-    logger.info("-"*70)
-    eu_success, eu_file = download_eu_sanctions()
-    results['eu'] = eu_success
+    downloaders = {
+        'un': download_un_sanctions,
+        'ofac': download_ofac_sanctions,
+        'uk': download_uk_sanctions,
+        'eu': download_eu_sanctions,
+    }
+    with ThreadPoolExecutor(max_workers=len(downloaders)) as executor:
+        futures = {source: executor.submit(download, force) for source, download in downloaders.items()}
+        for source, future in futures.items():
+            try:
+                results[source], _ = future.result()
+            except Exception as e:
+                logger.error(f"Error downloading {source.upper()} sanctions: {str(e)}", exc_info=True)
     
     # Run conversion scripts
     logger.info("\n" + "-"*70)
-    logger.info("5. Converting Sanctions Lists")
+    logger.info("2. Converting Sanctions Lists")
     logger.info("-"*70)
     
-    conversion_results = {}
-    
-    if results['un']:
-        conversion_results['un'] = run_conversion_script("convert_un_to_csv.py")
-    else:
-        logger.warning("Skipping UN conversion (download failed)")
-        conversion_results['un'] = False
-    
-    if results['ofac']:
-        conversion_results['ofac'] = run_conversion_script("convert_ofac_to_csv.py")
-    else:
-        logger.warning("Skipping OFAC conversion (download failed)")
-        conversion_results['ofac'] = False
-    
-    if results['uk']:
-        conversion_results['uk'] = run_conversion_script("convert_uk_to_csv.py")
-    else:
-        logger.warning("Skipping UK conversion (no file available)")
-        conversion_results['uk'] = False
-    
-    if results['eu']:
-        conversion_results['eu'] = run_conversion_script("convert_eu_to_csv.py")
-    else:
-        logger.warning("Skipping EU conversion (no file available)")
-        conversion_results['eu'] = False
+    # The converters read and write separate files, so run them side by side;
+    # each is its own Python process, so threads are enough to overlap them
+    skip_reasons = {
+        'un': "download failed",
+        'ofac': "download failed",
+        'uk': "no file available",
+        'eu': "no file available",
+    }
+    conversion_results = dict.fromkeys(skip_reasons, False)
+    to_convert = [source for source in skip_reasons if results[source]]
+    for source, reason in skip_reasons.items():
+        if not results[source]:
+            logger.warning(f"Skipping {source.upper()} conversion ({reason})")
+    # The UN converter parses with a process pool of its own; leave a CPU for
+    # each of the other converters running next to it
+    un_workers = max((os.cpu_count() or 1) - (len(to_convert) - 1), 1)
+    converter_env = {'un': {'UN_PARSE_WORKERS': str(un_workers)}}
+    with ThreadPoolExecutor(max_workers=len(skip_reasons)) as executor:
+        futures = {
+            source: executor.submit(run_conversion_script, f"convert_{source}_to_csv.py", converter_env.get(source))
+            for source in to_convert
+        }
+        for source, future in futures.items():
+            conversion_results[source] = future.result()
     
     # Combine all sanctions
     logger.info("\n" + "-"*70)
-    logger.info("6. Combining Sanctions Lists")
+    logger.info("3. Combining Sanctions Lists")
     logger.info("-"*70)
     
     combine_success = run_conversion_script("combine_sanctions.py")
@@ -475,7 +727,12 @@ def update_sanctions_lists(force: bool = False) -> int:
 
 def main() -> int:
     """Main function for command-line usage."""
-    return update_sanctions_lists(force=False)
+    parser = argparse.ArgumentParser(description="Download, convert and combine the sanctions lists.")
+    parser.add_argument('--force', action='store_true',
+                        help="re-download every list even if a recent copy exists")
+    args = parser.parse_args()
+    setup_logging()
+    return update_sanctions_lists(force=args.force)
 
 
 if __name__ == "__main__":
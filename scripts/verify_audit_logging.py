@@ -9,6 +9,7 @@ This script checks:
 4. Shows a sample of recent audit log entries
 """
 import json
+import mmap
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -17,22 +18,39 @@ from typing import List, Dict, Any
 AUDIT_LOG_DIR = Path("logs/audit")
 AUDIT_LOG_FILE = AUDIT_LOG_DIR / "audit.log"
 
+def mmap_open(path: Path) -> mmap.mmap:
+    """Map a non-empty file read-only, hinting that it will be read sequentially."""
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    return mm
+
 def read_audit_logs(limit: int = 10) -> List[Dict[str, Any]]:
     """Read recent audit log entries."""
     entries = []
     
-    if not AUDIT_LOG_FILE.exists():
+    if not AUDIT_LOG_FILE.exists() or AUDIT_LOG_FILE.stat().st_size == 0:
         return entries
     
     try:
-        with open(AUDIT_LOG_FILE, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f.readlines() if line.strip()]
-            for line in lines[-limit:]:  # Get last N entries
-                try:
-                    entry = json.loads(line)
-                    entries.append(entry)
-                except json.JSONDecodeError:
-                    continue
+        with mmap_open(AUDIT_LOG_FILE) as mm:
+            # Walk back from the end of the file for the last N non-empty
+            # lines, so only the tail of the log is ever read
+            lines = []
+            end = len(mm)
+            while end > 0 and len(lines) < limit:
+                start = mm.rfind(b'\n', 0, end) + 1
+                line = mm[start:end].strip()
+                if line:
+                    lines.append(line)
+                end = start - 1
+        for line in reversed(lines):
+            try:
+                entry = json.loads(line)
+                entries.append(entry)
+            except ValueError:
+                continue
     except Exception as e:
         print(f"Error reading audit log: {e}")
     
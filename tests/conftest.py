@@ -12,3 +12,82 @@ def pytest_addoption(parser):
         default=False,
         help="run slow integration tests that download real data"
     )
+
+
+def pytest_configure(config):
+    """Register custom markers."""
+    config.addinivalue_line("markers", "slow: downloads real data, needs --run-slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked slow unless --run-slow was given."""
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="use --run-slow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
+def real_sanctions_downloads(tmp_path_factory):
+    """
+    Download the real UN and OFAC lists once per session into a temp dir.
+
+    Yields a dict with the (success, result) tuple of each download, so the
+    slow tests share a single network round-trip instead of one each. The
+    two lists come from different hosts, so they are fetched side by side.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from scripts import update_sanctions
+
+    raw_dir = tmp_path_factory.mktemp("sanctions") / "raw"
+    raw_dir.mkdir()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(update_sanctions, "RAW_DIR", raw_dir)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            un = executor.submit(update_sanctions.download_un_sanctions)
+            ofac = executor.submit(update_sanctions.download_ofac_sanctions)
+            results = {"un": un.result(), "ofac": ofac.result()}
+        yield results
+
+
+@pytest.fixture(scope="session")
+def http():
+    """
+    A requests session shared by the tests that call the running API.
+
+    Keeps connections to the server alive between tests, instead of opening
+    a new one for every request.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    yield session
+    session.close()
+
+
+# Where the logging tests expect the API to be running
+LIVE_SERVER_URL = "http://localhost:8000"
+
+
+@pytest.fixture(scope="session")
+def live_server(http):
+    """
+    Make sure the API is up before tests that talk to it.
+
+    The first request also pays the server's lazy start-up costs (model
+    loading, first connection), so they don't land inside a test's wait.
+    Tests using this fixture are skipped when nothing is listening.
+    """
+    import requests
+
+    try:
+        http.get(f"{LIVE_SERVER_URL}/health", timeout=2)
+    except requests.ConnectionError:
+        pytest.skip(f"API server not running at {LIVE_SERVER_URL}")
+    return LIVE_SERVER_URL
@@ -0,0 +1,179 @@
+"""
+Incremental readers for the log files written by the running API.
+
+The logging tests poll the same files many times per test; a tail remembers
+how far it has read, so each poll only reads what was appended since.
+"""
+import itertools
+import json
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:  # not installed, or not on Linux
+    INotify = None
+
+READ_BUFFER_SIZE = 65536
+POLL_INTERVAL_SECONDS = 0.1
+
+
+class LogTail:
+    """Follow a log file, keeping every non-empty line read so far."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.offset = 0
+        self.inode: Optional[int] = None
+        self.pending = b""
+        self.entries: List[Any] = []
+
+    def parse(self, line: str) -> Optional[Any]:
+        """Turn a stripped line into an entry, or None to drop it."""
+        return line
+
+    def add(self, entry: Any) -> None:
+        """Record a parsed entry."""
+        self.entries.append(entry)
+
+    def poll(self) -> List[Any]:
+        """Read anything appended since the last poll and return all entries."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return self.entries
+
+        # A new inode or a shorter file means the log was rotated or
+        # truncated, so start again from the top of the new file
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self.inode = st.st_ino
+            self.offset = 0
+            self.pending = b""
+
+        if st.st_size == self.offset:
+            return self.entries
+
+        with open(self.path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+            f.seek(self.offset)
+            data = f.read()
+        self.offset += len(data)
+
+        # Hold back a trailing partial line until the writer finishes it
+        lines = (self.pending + data).split(b'\n')
+        self.pending = lines.pop()
+        for raw in lines:
+            line = raw.decode('utf-8', errors='replace').strip()
+            if not line:
+                continue
+            entry = self.parse(line)
+            if entry is not None:
+                self.add(entry)
+        return self.entries
+
+    def since(self, start: int) -> Iterator[Any]:
+        """Yield the entries read so far from index start onwards, without copying."""
+        return itertools.islice(self.entries, start, None)
+
+    def wait_until(self, check: Callable[[], Optional[Any]], timeout: float = 5.0) -> Optional[Any]:
+        """
+        Call check until it returns something other than None.
+
+        Between calls, blocks on inotify events for the log's directory when
+        inotify_simple is available, otherwise polls every
+        POLL_INTERVAL_SECONDS. The deadline uses the monotonic clock.
+
+        Returns:
+            The first non-None result, or None if the timeout ran out
+        """
+        deadline = time.monotonic_ns() + int(timeout * 1e9)
+        watcher = self._watch()
+        try:
+            while True:
+                result = check()
+                if result is not None:
+                    return result
+
+                remaining = (deadline - time.monotonic_ns()) / 1e9
+                if remaining <= 0:
+                    return None
+                if watcher is None:
+                    time.sleep(min(POLL_INTERVAL_SECONDS, remaining))
+                else:
+                    watcher.read(timeout=int(remaining * 1000) + 1)
+        finally:
+            if watcher is not None:
+                watcher.close()
+
+    def wait_for(self, predicate: Callable[[Any], bool], timeout: float = 5.0,
+                 start: int = 0) -> Optional[Any]:
+        """
+        Wait for an entry at index start or later that matches predicate.
+
+        Returns:
+            The newest matching entry, or None if none turned up in time
+        """
+        def check():
+            nonlocal start
+            entries = self.poll()
+            for i in range(len(entries) - 1, start - 1, -1):
+                if predicate(entries[i]):
+                    return entries[i]
+            start = max(start, len(entries))
+            return None
+
+        return self.wait_until(check, timeout)
+
+    def _watch(self):
+        """Watch the log's directory, so creates and rotations are seen too."""
+        if INotify is None or not self.path.parent.is_dir():
+            return None
+        watcher = INotify()
+        try:
+            watcher.add_watch(
+                str(self.path.parent),
+                inotify_flags.MODIFY | inotify_flags.CREATE | inotify_flags.MOVED_TO,
+            )
+        except OSError:
+            watcher.close()
+            return None
+        return watcher
+
+
+class AuditLogTail(LogTail):
+    """
+    Follow the JSON-lines audit log, keeping the decoded entries.
+
+    Entries are also indexed by request_id and event_type as they are read,
+    so lookups don't rescan the whole log.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.by_request: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.by_event: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    def parse(self, line: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json_loads(line)
+        except ValueError:
+            # Skip invalid JSON lines
+            return None
+
+    def add(self, entry: Any) -> None:
+        super().add(entry)
+        if not isinstance(entry, dict):
+            return
+        request_id = entry.get('request_id')
+        if request_id is not None:
+            self.by_request[request_id].append(entry)
+        event_type = entry.get('event_type')
+        if event_type is not None:
+            self.by_event[event_type].append(entry)
@@ -3,10 +3,14 @@ Test suite for API logging functionality.
 
 This test suite verifies that all API endpoints generate the expected log entries
 and that the logging format is consistent.
+
+The cases are independent, so they can run in parallel with pytest-xdist:
+    python -m pytest tests/test_api_logging.py -n 4
 """
 import json
 import re
 import time
+import uuid
 import pytest
 import logging
 from pathlib import Path
@@ -14,15 +18,23 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 import requests
 
+from tests.log_tail import LogTail
+
 # Configure test logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Every test here needs the API running; skip them all if it isn't
+pytestmark = pytest.mark.usefixtures("live_server")
+
 # Test configuration
 BASE_URL = "http://localhost:8000"
 LOGS_DIR = Path("logs")  # Using relative path to match the application's log directory
 AUDIT_LOG_DIR = LOGS_DIR / "audit"
 
+# Splits "timestamp - logger - level - message" log lines
+_LOG_LINE_RE = re.compile(r'\s+-\s+')
+
 # Sample test data
 TEST_USER = {
     "full_name": "Test User",
@@ -34,32 +46,51 @@ TEST_USER = {
     "selfie_image_base64": "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="   # 1x1 transparent pixel
 }
 
+# One tail per log file, shared across tests so each poll only reads new lines
+_LOG_TAILS: Dict[Path, LogTail] = {}
+
+def get_log_tail(log_file: Path) -> LogTail:
+    """Return the shared tail for a log file."""
+    if log_file not in _LOG_TAILS:
+        _LOG_TAILS[log_file] = LogTail(log_file)
+    return _LOG_TAILS[log_file]
+
+def wait_for_log_match(log_file: Path, predicate, start: int = 0, timeout: float = 5.0) -> Optional[str]:
+    """Wait for a log line at index start or later that matches predicate."""
+    return get_log_tail(log_file).wait_for(predicate, timeout=timeout, start=start)
+
 def get_log_entries(log_file: Path, timeout: int = 5) -> List[str]:
-    """Read log entries from the log file."""
-    start_time = time.time()
-    
-    while time.time() - start_time < timeout:
+    """
+    Read log entries from the log file.
+
+    Returns the tail's own list of entries, which later calls keep extending,
+    so callers that need a snapshot should remember its length.
+    """
+    tail = get_log_tail(log_file)
+
+    def read_entries():
         if not log_file.exists():
-            time.sleep(0.1)
-            continue
-            
+            return None
         try:
-            with open(log_file, 'r') as f:
-                return [line.strip() for line in f.readlines() if line.strip()]
+            return tail.poll()
         except (FileNotFoundError, PermissionError) as e:
             logger.error(f"Error reading log file {log_file}: {e}")
-            time.sleep(0.1)
-    
-    logger.warning(f"Timeout waiting for log file: {log_file}")
-    return []
+            return None
+
+    entries = tail.wait_until(read_entries, timeout)
+    if entries is None:
+        logger.warning(f"Timeout waiting for log file: {log_file}")
+        return []
+    return entries
 
 def find_matching_log_entry(log_entries: List[str], search_text: str) -> Optional[Dict[str, Any]]:
     """Find a log entry containing the search text and parse it."""
+    needle = search_text.lower()
     for entry in reversed(log_entries):
-        if search_text.lower() in entry.lower():
+        if needle in entry.lower():
             # Parse the log entry (this is a simplified parser)
             # Format: "timestamp - logger - level - message"
-            parts = re.split(r'\s+-\s+', entry, maxsplit=3)
+            parts = _LOG_LINE_RE.split(entry, maxsplit=3)
             if len(parts) >= 4:
                 timestamp, logger_name, level, message = parts
                 return {
@@ -70,161 +101,59 @@ def find_matching_log_entry(log_entries: List[str], search_text: str) -> Optiona
                 }
     return None
 
-def test_health_check():
-    """Test that the health check endpoint is logged correctly."""
-    # Get current log entries before making the request
-    log_file = LOGS_DIR / f"app-{datetime.now().strftime('%Y-%m-%d')}.log"
-    initial_logs = get_log_entries(log_file)
-    
-    # Make the request
-    logger.info(f"Making health check request to {BASE_URL}/health")
-    response = requests.get(f"{BASE_URL}/health")
-    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
-    
-    # Get the request ID from the response
-    request_id = response.headers.get("X-Request-ID")
-    assert request_id is not None, "Response missing X-Request-ID header"
-    logger.info(f"Request ID: {request_id}")
-    
-    # Get updated log entries
-    time.sleep(1)  # Give some time for logs to be written
-    updated_logs = get_log_entries(log_file)
-    
-    # Find new log entries
-    new_entries = updated_logs[len(initial_logs):] if initial_logs else updated_logs
-    
-    # Debug: Print new log entries
-    logger.info(f"New log entries ({len(new_entries)}):")
-    for i, entry in enumerate(new_entries, 1):
-        logger.info(f"  {i}. {entry}")
-    
-    # Check if we have any new log entries
-    assert len(new_entries) > 0, "No new log entries found after health check request"
-    
-    # Look for the health check log entry
-    health_check_found = any("/health" in entry for entry in new_entries)
-    assert health_check_found, "No log entry found for health check request"
+# Accepted status codes per case
+_OK_HEALTH_STATUS = frozenset({200})
+_OK_KYC_STATUS = frozenset({200, 400, 422})
+_NOT_FOUND_STATUS = frozenset({404})
+_VALIDATION_ERROR_STATUS = frozenset({422})
 
-def test_kyc_verification_logging():
-    """Test that KYC verification requests are logged correctly."""
-    # Get current log entries before making the request
-    log_file = LOGS_DIR / f"app-{datetime.now().strftime('%Y-%m-%d')}.log"
-    initial_logs = get_log_entries(log_file)
-    
-    # Make the request
-    logger.info(f"Making KYC verification request to {BASE_URL}/api/v1/kyc/verify")
-    try:
-        response = requests.post(
-            f"{BASE_URL}/api/v1/kyc/verify",
-            json=TEST_USER,
-            headers={"Content-Type": "application/json"}
-        )
-        logger.info(f"Response status: {response.status_code}")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request failed: {e}")
-        raise
-    
-    # Basic response validation
-    assert response.status_code in [200, 400, 422], f"Unexpected status code: {response.status_code}"
-    
-    # Get the request ID from the response
-    request_id = response.headers.get("X-Request-ID")
-    assert request_id is not None, "Response missing X-Request-ID header"
-    logger.info(f"Request ID: {request_id}")
-    
-    # Get updated log entries
-    time.sleep(1)  # Give some time for logs to be written
-    updated_logs = get_log_entries(log_file)
-    
-    # Find new log entries
-    new_entries = updated_logs[len(initial_logs):] if initial_logs else updated_logs
-    
-    # Debug: Print new log entries
-    logger.info(f"New log entries ({len(new_entries)}):")
-    for i, entry in enumerate(new_entries, 1):
-        logger.info(f"  {i}. {entry}")
-    
-    # Check if we have any new log entries
-    assert len(new_entries) > 0, "No new log entries found after KYC verification request"
-    
-    # Look for the KYC verification log entry
-    kyc_log_found = any("/api/v1/kyc/verify" in entry for entry in new_entries)
-    assert kyc_log_found, "No log entry found for KYC verification request"
+# (method, path, JSON body, accepted status codes, what the log must show)
+LOGGING_CASES = [
+    pytest.param("GET", "/health", None, _OK_HEALTH_STATUS,
+                 lambda entry: "/health" in entry, id="health_check"),
+    pytest.param("POST", "/api/v1/kyc/verify", TEST_USER, _OK_KYC_STATUS,
+                 lambda entry: "/api/v1/kyc/verify" in entry, id="kyc_verification"),
+    pytest.param("GET", f"/non-existent-endpoint-{int(time.time())}", None, _NOT_FOUND_STATUS,
+                 lambda entry: "404" in entry, id="invalid_endpoint"),
+    # Missing required fields, so we expect a 422 Unprocessable Entity
+    pytest.param("POST", "/api/v1/kyc/verify", {"invalid": "data"}, _VALIDATION_ERROR_STATUS,
+                 lambda entry: "422" in entry or "error" in entry.lower(), id="error_handling"),
+]
 
-def test_invalid_endpoint_logging():
-    """Test that requests to non-existent endpoints are logged correctly."""
+@pytest.mark.parametrize("method,path,json_body,expected_status,matches", LOGGING_CASES)
+def test_request_logging(http, method, path, json_body, expected_status, matches):
+    """Test that requests to each endpoint are logged correctly."""
     # Get current log entries before making the request
     log_file = LOGS_DIR / f"app-{datetime.now().strftime('%Y-%m-%d')}.log"
-    initial_logs = get_log_entries(log_file)
+    initial_count = len(get_log_entries(log_file))
     
-    # Make a request to a non-existent endpoint
-    non_existent_endpoint = f"{BASE_URL}/non-existent-endpoint-{int(time.time())}"
-    logger.info(f"Making request to non-existent endpoint: {non_existent_endpoint}")
+    # A unique request ID keeps our log lines apart from those of tests
+    # running at the same time in other workers
+    request_id = f"test_api_{uuid.uuid4().hex}"
     
+    # Make the request
+    logger.info(f"Making {method} request to {BASE_URL}{path}")
     try:
-        response = requests.get(non_existent_endpoint)
-        logger.info(f"Response status: {response.status_code}")
-        assert response.status_code == 404, f"Expected status code 404, got {response.status_code}"
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request failed: {e}")
-        raise
-    
-    # Get the request ID from the response
-    request_id = response.headers.get("X-Request-ID")
-    assert request_id is not None, "Response missing X-Request-ID header"
-    logger.info(f"Request ID: {request_id}")
-    
-    # Get updated log entries
-    time.sleep(1)  # Give some time for logs to be written
-    updated_logs = get_log_entries(log_file)
-    
-    # Find new log entries
-    new_entries = updated_logs[len(initial_logs):] if initial_logs else updated_logs
-    
-    # Debug: Print new log entries
-    logger.info(f"New log entries ({len(new_entries)}):")
-    for i, entry in enumerate(new_entries, 1):
-        logger.info(f"  {i}. {entry}")
-    
-    # Check if we have any new log entries
-    assert len(new_entries) > 0, "No new log entries found after 404 request"
-    
-    # Look for the 404 log entry
-    not_found_log_found = any("404" in entry for entry in new_entries)
-    assert not_found_log_found, "No 404 log entry found for non-existent endpoint"
-
-def test_error_handling_logging():
-    """Test that server errors are logged correctly."""
-    # Get current log entries before making the request
-    log_file = LOGS_DIR / f"app-{datetime.now().strftime('%Y-%m-%d')}.log"
-    initial_logs = get_log_entries(log_file)
-    
-    # Make a malformed request to the KYC endpoint
-    logger.info("Making malformed KYC verification request to trigger validation error")
-    try:
-        response = requests.post(
-            f"{BASE_URL}/api/v1/kyc/verify",
-            json={"invalid": "data"},  # Missing required fields
-            headers={"Content-Type": "application/json"}
+        response = http.request(
+            method,
+            f"{BASE_URL}{path}",
+            json=json_body,
+            headers={"X-Request-ID": request_id}
         )
         logger.info(f"Response status: {response.status_code}")
-        # We expect a 422 Unprocessable Entity for invalid data
-        assert response.status_code == 422, f"Expected status code 422, got {response.status_code}"
     except requests.exceptions.RequestException as e:
         logger.error(f"Request failed: {e}")
         raise
     
-    # Get the request ID from the response
-    request_id = response.headers.get("X-Request-ID")
-    assert request_id is not None, "Response missing X-Request-ID header"
-    logger.info(f"Request ID: {request_id}")
+    assert response.status_code in expected_status, f"Unexpected status code: {response.status_code}"
+    assert response.headers.get("X-Request-ID") == request_id, "Response missing X-Request-ID header"
     
-    # Get updated log entries
-    time.sleep(1)  # Give some time for logs to be written
-    updated_logs = get_log_entries(log_file)
+    # Wait for the request to be logged
+    wait_for_log_match(log_file, lambda e: request_id in e and matches(e), start=initial_count)
+    get_log_entries(log_file)
     
-    # Find new log entries
-    new_entries = updated_logs[len(initial_logs):] if initial_logs else updated_logs
+    # Find new log entries for this request
+    new_entries = [entry for entry in get_log_tail(log_file).since(initial_count) if request_id in entry]
     
     # Debug: Print new log entries
     logger.info(f"New log entries ({len(new_entries)}):")
@@ -232,11 +161,10 @@ def test_error_handling_logging():
         logger.info(f"  {i}. {entry}")
     
     # Check if we have any new log entries
-    assert len(new_entries) > 0, "No new log entries found after error request"
+    assert len(new_entries) > 0, f"No new log entries found after {method} {path}"
     
-    # Look for the error log entry
-    error_log_found = any("422" in entry or "error" in entry.lower() for entry in new_entries)
-    assert error_log_found, "No error log entry found for malformed request"
+    # Look for the expected log entry
+    assert any(matches(entry) for entry in new_entries), f"No matching log entry found for {method} {path}"
 
 # This allows running the tests directly with python -m pytest tests/test_api_logging.py -v
 if __name__ == "__main__":
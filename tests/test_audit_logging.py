@@ -14,74 +14,67 @@ import logging
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional, List
-import requests
-import base64
-from PIL import Image
-from io import BytesIO
+
+from tests.log_tail import AuditLogTail
 
 # Configure test logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Every test here needs the API running; skip them all if it isn't
+pytestmark = pytest.mark.usefixtures("live_server")
+
 # Test configuration
 BASE_URL = "http://localhost:8000"
 AUDIT_LOG_DIR = Path("logs/audit")
 AUDIT_LOG_FILE = AUDIT_LOG_DIR / "audit.log"
 
-# Create a minimal valid image (1x1 pixel PNG)
+# A minimal valid image: a 1x1 pixel PNG, already base64-encoded
 def create_test_image_base64() -> str:
-    """Create a minimal valid base64-encoded image for testing."""
-    # Create a 1x1 pixel image
-    img = Image.new('RGB', (1, 1), color='white')
-    buffer = BytesIO()
-    img.save(buffer, format='PNG')
-    img_bytes = buffer.getvalue()
-    return base64.b64encode(img_bytes).decode('utf-8')
+    """Return a minimal valid base64-encoded image for testing."""
+    return "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
 
 TEST_IMAGE_BASE64 = create_test_image_base64()
 
+# Shared across tests so each poll only parses lines appended since the last one
+_AUDIT_TAIL = AuditLogTail(AUDIT_LOG_FILE)
+
 def get_audit_log_entries(timeout: int = 5) -> List[Dict[str, Any]]:
     """Read and parse audit log entries from the audit log file."""
-    start_time = time.time()
-    entries = []
-    
-    while time.time() - start_time < timeout:
+    def read_entries():
         if not AUDIT_LOG_FILE.exists():
-            time.sleep(0.1)
-            continue
-        
+            return None
         try:
-            with open(AUDIT_LOG_FILE, 'r', encoding='utf-8') as f:
-                lines = [line.strip() for line in f.readlines() if line.strip()]
-                for line in lines:
-                    try:
-                        entry = json.loads(line)
-                        entries.append(entry)
-                    except json.JSONDecodeError:
-                        # Skip invalid JSON lines
-                        continue
-            break
+            return _AUDIT_TAIL.poll()
         except (FileNotFoundError, PermissionError) as e:
             logger.error(f"Error reading audit log file {AUDIT_LOG_FILE}: {e}")
-            time.sleep(0.1)
-    
-    return entries
+            return None
 
-def find_audit_entry_by_request_id(entries: List[Dict[str, Any]], request_id: str) -> Optional[Dict[str, Any]]:
-    """Find an audit log entry by request ID."""
-    for entry in reversed(entries):
-        if entry.get('request_id') == request_id:
-            return entry
-    return None
+    entries = _AUDIT_TAIL.wait_until(read_entries, timeout)
+    return entries if entries is not None else []
 
-def find_audit_entry_by_event_type(entries: List[Dict[str, Any]], event_type: str, request_id: str = None) -> Optional[Dict[str, Any]]:
-    """Find an audit log entry by event type and optionally request ID."""
-    for entry in reversed(entries):
+def find_audit_entry_by_request_id(request_id: str) -> Optional[Dict[str, Any]]:
+    """Find the latest audit log entry read so far with the given request ID."""
+    matches = _AUDIT_TAIL.by_request.get(request_id)
+    return matches[-1] if matches else None
+
+def find_audit_entry_by_event_type(event_type: str, request_id: str = None) -> Optional[Dict[str, Any]]:
+    """Find the latest audit log entry read so far by event type and optionally request ID."""
+    if request_id is None:
+        matches = _AUDIT_TAIL.by_event.get(event_type)
+        return matches[-1] if matches else None
+    for entry in reversed(_AUDIT_TAIL.by_request.get(request_id, ())):
         if entry.get('event_type') == event_type:
-            if request_id is None or entry.get('request_id') == request_id:
-                return entry
+            return entry
     return None
 
+def wait_for_audit_entry(event_type: str, request_id: Optional[str], timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+    """Wait for an audit log entry with the given event type and request ID."""
+    return _AUDIT_TAIL.wait_for(
+        lambda entry: entry.get('event_type') == event_type and entry.get('request_id') == request_id,
+        timeout=timeout,
+    )
+
 def verify_audit_entry_fields(entry: Dict[str, Any], required_fields: List[str]) -> tuple[bool, List[str]]:
     """Verify that an audit entry contains all required fields."""
     missing_fields = []
@@ -96,11 +89,10 @@ class TestAuditLogging:
     def setup_method(self):
         """Setup method called before each test."""
         # Get initial audit log entries count
-        self.initial_entries = get_audit_log_entries()
-        self.initial_count = len(self.initial_entries)
+        self.initial_count = len(get_audit_log_entries())
         logger.info(f"Initial audit log entries count: {self.initial_count}")
     
-    def test_kyc_verify_audit_logging(self):
+    def test_kyc_verify_audit_logging(self, http):
         """Test that KYC verify endpoint logs audit events with all required fields."""
         # Prepare test payload
         payload = {
@@ -125,7 +117,7 @@ class TestAuditLogging:
         
         # Make the request
         logger.info(f"Making KYC verify request to {BASE_URL}/api/v1/kyc/verify")
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/v1/kyc/verify",
             json=payload,
             headers={"Content-Type": "application/json", "X-Request-ID": f"test_kyc_{int(time.time())}"}
@@ -144,26 +136,18 @@ class TestAuditLogging:
             except:
                 logger.warning(f"Response text: {response.text[:200]}")
         
-        # Wait for audit log to be written with retry logic
-        audit_entry = None
-        for attempt in range(5):
-            time.sleep(1)
-            # Get all audit log entries and search by request_id
-            entries = get_audit_log_entries(timeout=2)
-            audit_entry = find_audit_entry_by_event_type(entries, "kyc_verification", request_id)
-            if audit_entry is not None:
-                break
-            logger.info(f"Attempt {attempt + 1}: Audit log not found yet, retrying...")
+        # Wait for the audit log entry to be written
+        audit_entry = wait_for_audit_entry("kyc_verification", request_id)
         
         # If still not found, try searching all entries one more time
         if audit_entry is None:
             entries = get_audit_log_entries(timeout=5)
-            audit_entry = find_audit_entry_by_event_type(entries, "kyc_verification", request_id)
+            audit_entry = find_audit_entry_by_event_type("kyc_verification", request_id)
         
         # If still not found, try searching without request_id filter
         if audit_entry is None:
             entries = get_audit_log_entries(timeout=2)
-            audit_entry = find_audit_entry_by_event_type(entries, "kyc_verification", None)
+            audit_entry = find_audit_entry_by_event_type("kyc_verification", None)
             if audit_entry:
                 logger.warning(f"Found kyc_verification entry but with different request_id: {audit_entry.get('request_id')} (expected: {request_id})")
         
@@ -205,7 +189,7 @@ class TestAuditLogging:
         
         logger.info("✓ KYC verify audit logging test passed")
     
-    def test_aml_screen_audit_logging(self):
+    def test_aml_screen_audit_logging(self, http):
         """Test that AML screen endpoint logs audit events with all required fields."""
         # Prepare test payload
         payload = {
@@ -216,7 +200,7 @@ class TestAuditLogging:
         
         # Make the request
         logger.info(f"Making AML screen request to {BASE_URL}/api/v1/aml/screen")
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/v1/aml/screen",
             json=payload,
             headers={"Content-Type": "application/json", "X-Request-ID": f"test_aml_{int(time.time())}"}
@@ -226,21 +210,13 @@ class TestAuditLogging:
         assert request_id is not None, "Response missing X-Request-ID header"
         logger.info(f"Request ID: {request_id}")
         
-        # Wait for audit log to be written with retry logic
-        audit_entry = None
-        for attempt in range(5):
-            time.sleep(1)
-            # Get all audit log entries and search by request_id
-            entries = get_audit_log_entries(timeout=2)
-            audit_entry = find_audit_entry_by_event_type(entries, "aml_screening", request_id)
-            if audit_entry is not None:
-                break
-            logger.info(f"Attempt {attempt + 1}: Audit log not found yet, retrying...")
+        # Wait for the audit log entry to be written
+        audit_entry = wait_for_audit_entry("aml_screening", request_id)
         
         # If still not found, try searching all entries one more time
         if audit_entry is None:
             entries = get_audit_log_entries(timeout=5)
-            audit_entry = find_audit_entry_by_event_type(entries, "aml_screening", request_id)
+            audit_entry = find_audit_entry_by_event_type("aml_screening", request_id)
         
         if audit_entry is None:
             # Get all entries for debugging
@@ -276,7 +252,7 @@ class TestAuditLogging:
         
         logger.info("✓ AML screen audit logging test passed")
     
-    def test_risk_combined_audit_logging(self):
+    def test_risk_combined_audit_logging(self, http):
         """Test that Risk combined endpoint logs audit events with all required fields."""
         # Prepare test payload
         payload = {
@@ -308,7 +284,7 @@ class TestAuditLogging:
         
         # Make the request
         logger.info(f"Making Risk combined request to {BASE_URL}/api/v1/risk/combined")
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/v1/risk/combined",
             json=payload,
             headers={"Content-Type": "application/json", "X-Request-ID": f"test_risk_{int(time.time())}"}
@@ -327,26 +303,18 @@ class TestAuditLogging:
             except:
                 logger.warning(f"Response text: {response.text[:200]}")
         
-        # Wait for audit log to be written with retry logic
-        audit_entry = None
-        for attempt in range(5):
-            time.sleep(1)
-            # Get all audit log entries and search by request_id
-            entries = get_audit_log_entries(timeout=2)
-            audit_entry = find_audit_entry_by_event_type(entries, "combined_risk_assessment", request_id)
-            if audit_entry is not None:
-                break
-            logger.info(f"Attempt {attempt + 1}: Audit log not found yet, retrying...")
+        # Wait for the audit log entry to be written
+        audit_entry = wait_for_audit_entry("combined_risk_assessment", request_id)
         
         # If still not found, try searching all entries one more time
         if audit_entry is None:
             entries = get_audit_log_entries(timeout=5)
-            audit_entry = find_audit_entry_by_event_type(entries, "combined_risk_assessment", request_id)
+            audit_entry = find_audit_entry_by_event_type("combined_risk_assessment", request_id)
         
         # If still not found, try searching without request_id filter
         if audit_entry is None:
             entries = get_audit_log_entries(timeout=2)
-            audit_entry = find_audit_entry_by_event_type(entries, "combined_risk_assessment", None)
+            audit_entry = find_audit_entry_by_event_type("combined_risk_assessment", None)
             if audit_entry:
                 logger.warning(f"Found combined_risk_assessment entry but with different request_id: {audit_entry.get('request_id')} (expected: {request_id})")
         
@@ -389,7 +357,7 @@ class TestAuditLogging:
         
         logger.info("✓ Risk combined audit logging test passed")
     
-    def test_audit_log_timestamp_format(self):
+    def test_audit_log_timestamp_format(self, http):
         """Test that audit logs have proper ISO format timestamps."""
         # Make a simple request to generate an audit log
         payload = {
@@ -398,17 +366,14 @@ class TestAuditLogging:
             "nationality": "US"
         }
         
-        response = requests.post(
+        response = http.post(
             f"{BASE_URL}/api/v1/aml/screen",
             json=payload,
             headers={"Content-Type": "application/json", "X-Request-ID": f"test_timestamp_{int(time.time())}"}
         )
         
         request_id = response.headers.get("X-Request-ID")
-        time.sleep(2)
-        
-        entries = get_audit_log_entries()
-        audit_entry = find_audit_entry_by_event_type(entries, "aml_screening", request_id)
+        audit_entry = wait_for_audit_entry("aml_screening", request_id)
         
         assert audit_entry is not None, "No audit entry found"
         assert 'timestamp' in audit_entry, "Missing timestamp field"
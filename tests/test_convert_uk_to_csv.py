@@ -0,0 +1,80 @@
+"""
+Tests for the UK sanctions list normalization.
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.convert_uk_to_csv import create_normalized_uk_data
+
+COLUMN_ORDER = [
+    'source', 'source_file', 'dataid', 'reference_number', 'list_type',
+    'record_type', 'name', 'first_name', 'middle_name', 'last_name',
+    'aliases', 'nationalities', 'gender', 'pob_cities', 'pob_countries',
+    'dob_dates', 'dob_years', 'addresses', 'id_numbers', 'program',
+    'comments', 'last_updated', 'processing_date'
+]
+
+
+@pytest.fixture
+def uk_df() -> pd.DataFrame:
+    """A few raw UK rows, with padded column names and missing cells as in the ODS file."""
+    return pd.DataFrame({
+        ' Unique ID ': [' RUS0001 ', 'AFG0002', 'SYR0003', 'XXX0004'],
+        'OFSI Group ID': [np.nan, '12345', '', np.nan],
+        'Type': ['Individual', 'Entity', 'Ship', np.nan],
+        'Name': ['Mr John  Smith Jr', 'Acme Trading LLC', 'Sea Star', 'Somebody'],
+        'Regime Name': ['Russia', 'Afghanistan', 'Syria', np.nan],
+        'Designation Source': ['UN', 'UN', 'OFSI', 'OFSI'],
+        'Sanctions Imposed': ['Asset freeze', 'Asset freeze|Trust services', np.nan, ''],
+    }, index=[10, 11, 12, 13])
+
+
+def test_normalized_uk_data(uk_df: pd.DataFrame) -> None:
+    """Test that raw UK rows are normalized into the shared column layout."""
+    today = date.today().isoformat()
+    raw = uk_df.copy()
+
+    result = create_normalized_uk_data(uk_df)
+
+    expected = pd.DataFrame({
+        'source': ['UK'] * 4,
+        'source_file': ['FCDO_SL_Wed_Nov_19_2025.ods'] * 4,
+        'dataid': ['RUS0001', 'AFG0002', 'SYR0003', 'XXX0004'],
+        'reference_number': ['RUS0001', '12345', 'SYR0003', 'XXX0004'],
+        'list_type': ['UK Sanctions List'] * 4,
+        'record_type': ['individual', 'entity', 'vessel', 'other'],
+        'name': ['JOHN SMITH', 'ACME TRADING LLC', 'SEA STAR', 'SOMEBODY'],
+        'first_name': ['JOHN', 'ACME', 'SEA', 'SOMEBODY'],
+        'middle_name': ['', 'TRADING', '', ''],
+        'last_name': ['SMITH', 'LLC', 'STAR', 'SOMEBODY'],
+        'aliases': [''] * 4,
+        'nationalities': ['RUSSIA; RUSSIAN FEDERATION', 'AFGHANISTAN', '', ''],
+        'gender': [''] * 4,
+        'pob_cities': [''] * 4,
+        'pob_countries': [''] * 4,
+        'dob_dates': [''] * 4,
+        'dob_years': [''] * 4,
+        'addresses': [''] * 4,
+        'id_numbers': [''] * 4,
+        'program': ['Russia', 'Afghanistan', 'Syria', ''],
+        'comments': ['Asset freeze', 'Asset freeze|Trust services', '', ''],
+        'last_updated': [today] * 4,
+        'processing_date': [today] * 4,
+    }, columns=COLUMN_ORDER)
+    pd.testing.assert_frame_equal(result, expected)
+
+    # The caller's frame is left as it was
+    pd.testing.assert_frame_equal(uk_df, raw)
+
+
+@pytest.mark.parametrize("uk_df", [
+    pd.DataFrame(),
+    pd.DataFrame(columns=['Unique ID', 'Type', 'Name']),
+], ids=["no-columns", "no-rows"])
+def test_normalized_uk_data_empty(uk_df: pd.DataFrame) -> None:
+    """Test that an empty UK frame gives an empty result."""
+    result = create_normalized_uk_data(uk_df)
+    pd.testing.assert_frame_equal(result, pd.DataFrame())
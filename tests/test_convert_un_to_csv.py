@@ -0,0 +1,72 @@
+"""
+Tests for the UN sanctions XML to CSV conversion.
+"""
+import csv
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from scripts import convert_un_to_csv
+from scripts.convert_un_to_csv import COLUMN_ORDER, convert_xml_to_csv
+
+INDIVIDUAL_COUNT = 100
+
+INDIVIDUAL_XML = """  <INDIVIDUAL>
+    <DATAID>{dataid}</DATAID>
+    <FIRST_NAME>First{index}</FIRST_NAME>
+    <SECOND_NAME>Last{index}</SECOND_NAME>
+    <UN_LIST_TYPE>Al-Qaida</UN_LIST_TYPE>
+    <REFERENCE_NUMBER>QDi.{index:03d}</REFERENCE_NUMBER>
+    <LISTED_ON>2011-1-2</LISTED_ON>
+    <NATIONALITY><VALUE>Afghanistan</VALUE></NATIONALITY>
+    <LAST_DAY_UPDATED><VALUE>2012-03-04</VALUE><VALUE>2013-5-6</VALUE></LAST_DAY_UPDATED>
+    <INDIVIDUAL_ALIAS><QUALITY>Good</QUALITY><ALIAS_NAME>Alias {index}</ALIAS_NAME></INDIVIDUAL_ALIAS>
+    <INDIVIDUAL_DATE_OF_BIRTH><YEAR>1970</YEAR></INDIVIDUAL_DATE_OF_BIRTH>
+  </INDIVIDUAL>
+"""
+
+
+@pytest.fixture
+def un_xml(tmp_path: Path) -> Path:
+    """A small UN list, with data ids out of numeric order."""
+    individuals = "".join(
+        INDIVIDUAL_XML.format(dataid=(index * 37) % 1000 + 1, index=index)
+        for index in range(INDIVIDUAL_COUNT)
+    )
+    xml_path = tmp_path / "consolidatedLegacyByPRN.xml"
+    xml_path.write_text(
+        f'<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<CONSOLIDATED_LIST><INDIVIDUALS>\n{individuals}</INDIVIDUALS></CONSOLIDATED_LIST>\n',
+        encoding="utf-8"
+    )
+    return xml_path
+
+
+def read_rows(path: Path) -> List[List[str]]:
+    """Read a converted CSV back, header first."""
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f, escapechar="\\"))
+
+
+def test_pool_and_in_process_parse_match(un_xml: Path, tmp_path: Path, monkeypatch) -> None:
+    """Test that parsing in a process pool gives the same rows, in input order, as parsing in-process."""
+    # Small batches, so the pool runs and the in-flight window fills up
+    monkeypatch.setattr(convert_un_to_csv, "PARSE_BATCH_SIZE", 8)
+
+    serial_path, serial_count = convert_xml_to_csv(un_xml, tmp_path / "serial", workers=1)
+    pooled_path, pooled_count = convert_xml_to_csv(un_xml, tmp_path / "pooled", workers=2)
+
+    assert serial_count == pooled_count == INDIVIDUAL_COUNT
+    serial_rows = read_rows(serial_path)
+    assert read_rows(pooled_path) == serial_rows
+
+    assert serial_rows[0] == COLUMN_ORDER
+    dataid = COLUMN_ORDER.index("dataid")
+    expected_ids = [str((index * 37) % 1000 + 1) for index in range(INDIVIDUAL_COUNT)]
+    assert [row[dataid] for row in serial_rows[1:]] == expected_ids
+
+    first = dict(zip(COLUMN_ORDER, serial_rows[1]))
+    assert first["name"] == "FIRST0 LAST0"
+    assert first["listed_on"] == "2011-01-02"
+    assert first["last_updated"] == "2013-05-06"
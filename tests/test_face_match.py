@@ -8,21 +8,37 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from app.services.face_match import FaceMatchingService
 
-def test_face_matching(document_path: str, selfie_path: str):
+# The face model works on small crops, so full-resolution scans aren't needed
+DEFAULT_MAX_SIZE = 512
+
+def load_image(path: str, max_size: int = DEFAULT_MAX_SIZE) -> Image.Image:
+    """
+    Load an image, letting JPEGs decode at a reduced scale.
+
+    draft() makes libjpeg decode at the smallest 1/2, 1/4 or 1/8 scale that
+    is still at least max_size on each side; other formats load as usual.
+    """
+    img = Image.open(path)
+    img.draft('RGB', (max_size, max_size))
+    img.load()
+    return img
+
+def test_face_matching(document_path: str, selfie_path: str, max_size: int = DEFAULT_MAX_SIZE):
     """
     Test face matching between a document image and a selfie.
     
     Args:
         document_path: Path to the document image (e.g., ID card/passport)
         selfie_path: Path to the selfie image
+        max_size: Target size for reduced-scale JPEG decoding
     """
     try:
         # Load images
         print(f"Loading document image: {document_path}")
-        document_img = Image.open(document_path)
+        document_img = load_image(document_path, max_size)
         
         print(f"Loading selfie image: {selfie_path}")
-        selfie_img = Image.open(selfie_path)
+        selfie_img = load_image(selfie_path, max_size)
         
         # Perform face matching
         print("\nRunning face matching...")
@@ -57,6 +73,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Test face matching between document and selfie images')
     parser.add_argument('document', help='Path to document image (ID/passport)')
     parser.add_argument('selfie', help='Path to selfie image')
+    parser.add_argument('--max-size', type=int, default=DEFAULT_MAX_SIZE,
+                        help=f'Target size for reduced-scale JPEG decoding (default: {DEFAULT_MAX_SIZE})')
     
     args = parser.parse_args()
     
@@ -68,4 +86,4 @@ if __name__ == "__main__":
         print(f"Error: Selfie image not found at {args.selfie}")
         sys.exit(1)
     
-    test_face_matching(args.document, args.selfie)
+    test_face_matching(args.document, args.selfie, args.max_size)
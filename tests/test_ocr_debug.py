@@ -10,19 +10,39 @@ This script helps debug OCR issues by:
 """
 import sys
 import os
-import tempfile
+import threading
+import traceback
 from pathlib import Path
 import cv2
 import numpy as np
 from PIL import Image
-import easyocr
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from app.core.mrz_detect import main as mrz_main
-from app.core.ocr import parse_mrz, extract_mrz_from_image, validate_document_ocr
+from app.core.ocr import parse_mrz, extract_mrz_from_image, validate_document_ocr, try_extract_mrz_at_orientation, guess_mrz_orientations
+from app.core.id_ocr import get_ocr_reader
+
+# Orientations are probed on a half-size decode when that is still at least
+# this wide; smaller images are probed at full size
+MIN_PROBE_WIDTH = 800
+
+def preload_ocr_reader():
+    """
+    Start building the EasyOCR reader in the background.
+    
+    Loading the models takes a while, so this lets it overlap MRZ detection;
+    get_ocr_reader() waits for it to finish. Errors are left for that call
+    to report.
+    """
+    def load():
+        try:
+            get_ocr_reader()
+        except Exception:
+            pass
+    threading.Thread(target=load, name="ocr-reader-preload", daemon=True).start()
 
 def print_section(title: str):
     """Print a formatted section header"""
@@ -39,13 +59,18 @@ def test_mrz_extraction(image_path: str, debug: bool = True):
         return None
     
     print(f"📄 Loading image: {image_path}")
-    img = cv2.imread(image_path)
+    # The detector's thresholds are relative to the image size, so finding
+    # the orientation works at half size; only the winner is redone at full size
+    img = cv2.imread(image_path, cv2.IMREAD_REDUCED_COLOR_2)
+    reduced = img is not None and img.shape[1] >= MIN_PROBE_WIDTH
+    if not reduced:
+        img = cv2.imread(image_path)
     if img is None:
         print(f"❌ Failed to load image with OpenCV")
         return None
     
     H, W = img.shape[:2]
-    print(f"✅ Image loaded: {W}x{H} pixels")
+    print(f"✅ Image loaded: {W}x{H} pixels{' (half size for the orientation probe)' if reduced else ''}")
     
     # Create debug directory
     if debug:
@@ -53,9 +78,9 @@ def test_mrz_extraction(image_path: str, debug: bool = True):
         debug_dir.mkdir(exist_ok=True)
         print(f"📁 Debug images will be saved to: {debug_dir.absolute()}")
     
-    # Try different orientations
-    orientations = [0, 90, 180, 270]
-    print(f"\n🔄 Trying MRZ extraction at different orientations (0°, 90°, 180°, 270°)...")
+    # Try different orientations, the likely ones first
+    orientations = guess_mrz_orientations(img)
+    print(f"\n🔄 Trying MRZ extraction at different orientations ({', '.join(f'{o}°' for o in orientations)})...")
     
     for orientation in orientations:
         try:
@@ -68,25 +93,22 @@ def test_mrz_extraction(image_path: str, debug: bool = True):
             elif orientation == 270:
                 img_rotated = cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE)
             
-            # Save rotated image temporarily
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
-                tmp_path = tmp_file.name
-                cv2.imwrite(tmp_path, img_rotated)
+            mrz_image = mrz_main(img_rotated, debug=debug and orientation == 0)  # Only debug first orientation
             
-            try:
-                mrz_image = mrz_main(tmp_path, debug=debug and orientation == 0)  # Only debug first orientation
-                
-                if mrz_image is not None:
-                    print(f"✅ MRZ found at {orientation}° orientation!")
-                    print(f"   MRZ region: {mrz_image.shape[1]}x{mrz_image.shape[0]} pixels")
-                    if debug:
-                        print(f"   Saved to: debug/mrz.jpg")
-                    return mrz_image
-                else:
-                    print(f"   ❌ No MRZ at {orientation}°")
-            finally:
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
+            if mrz_image is not None:
+                print(f"✅ MRZ found at {orientation}° orientation!")
+                if reduced:
+                    full_mrz = try_extract_mrz_at_orientation(cv2.imread(image_path), orientation)
+                    if full_mrz is not None:
+                        mrz_image = full_mrz
+                    else:
+                        print("   ⚠️  Not found again at full size, keeping the half-size crop")
+                print(f"   MRZ region: {mrz_image.shape[1]}x{mrz_image.shape[0]} pixels")
+                if debug:
+                    print(f"   Saved to: debug/mrz.jpg")
+                return mrz_image
+            else:
+                print(f"   ❌ No MRZ at {orientation}°")
                     
         except Exception as e:
             print(f"   ⚠️  Error at {orientation}°: {str(e)}")
@@ -125,7 +147,6 @@ def test_mrz_extraction_from_pil(image_path: str):
         
     except Exception as e:
         print(f"❌ Error during MRZ extraction: {str(e)}")
-        import traceback
         traceback.print_exc()
         return None
 
@@ -140,7 +161,8 @@ def test_ocr_text_extraction(mrz_image: np.ndarray):
     try:
         print("🔄 Initializing EasyOCR reader...")
         print("   (This may take a while on first run)")
-        reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+        # Same reader the service uses, so the full pipeline step reuses it
+        reader = get_ocr_reader()
         print("✅ EasyOCR reader initialized")
         
         print("\n🔄 Extracting text from MRZ image...")
@@ -171,7 +193,6 @@ def test_ocr_text_extraction(mrz_image: np.ndarray):
         
     except Exception as e:
         print(f"❌ Error during OCR text extraction: {str(e)}")
-        import traceback
         traceback.print_exc()
         return None
 
@@ -212,7 +233,6 @@ def test_mrz_parsing(mrz_text: str):
         
     except Exception as e:
         print(f"❌ Error during MRZ parsing: {str(e)}")
-        import traceback
         traceback.print_exc()
         return None
 
@@ -252,7 +272,6 @@ def test_full_ocr_validation(image_path: str):
         
     except Exception as e:
         print(f"❌ Error during full OCR validation: {str(e)}")
-        import traceback
         traceback.print_exc()
         return None
 
@@ -291,6 +310,10 @@ def main():
     print(f"Image: {image_path}")
     print(f"Debug mode: {debug}")
     
+    # Steps 2 and 4 need the OCR reader; load it while step 1 runs
+    if args.step in (None, 2, 4, 5):
+        preload_ocr_reader()
+    
     # Step 1: MRZ Extraction (file path method)
     if args.step is None or args.step == 1 or args.step == 5:
         mrz_image = test_mrz_extraction(image_path, debug=debug)
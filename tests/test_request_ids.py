@@ -5,43 +5,95 @@ Run this after starting the server: uvicorn app.main:app --reload
 """
 import requests
 import json
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+
+# orjson parses the audit entries much faster; fall back to the stdlib
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 BASE_URL = "http://127.0.0.1:8000"
 AUDIT_LOG_DIR = Path("./logs/audit")
+READ_CHUNK_SIZE = 1 << 20
+
+# One keep-alive session shared by the endpoint threads
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+SESSION.headers["Content-Type"] = "application/json"
+
+_PRINT_LOCK = threading.Lock()
+
+def section_header(title):
+    """Return a section header"""
+    return f"\n{'='*60}\n  {title}\n{'='*60}\n"
 
 def print_section(title):
     """Print a section header"""
-    print(f"\n{'='*60}")
-    print(f"  {title}")
-    print(f"{'='*60}\n")
+    print(section_header(title))
 
-def test_endpoint(name, url, payload):
+def test_endpoint(title, name, url, payload):
     """Test an endpoint and return the response"""
-    print(f"Testing {name}...")
-    print(f"Request: {json.dumps(payload, indent=2)}")
+    # Endpoints are tested concurrently, so collect the report and print it in one piece
+    out = [
+        section_header(title),
+        f"Testing {name}...",
+        f"Request: {json.dumps(payload, indent=2)}",
+    ]
     
     try:
-        response = requests.post(url, json=payload, headers={"Content-Type": "application/json"})
+        response = SESSION.post(url, json=payload)
         response.raise_for_status()
         result = response.json()
         
-        print(f"\n✓ Response received")
-        print(f"✓ Request ID: {result.get('request_id', 'NOT FOUND')}")
+        out.append(f"\n✓ Response received")
+        out.append(f"✓ Request ID: {result.get('request_id', 'NOT FOUND')}")
         
         if 'request_id' in result:
-            print(f"  → UUID format: {'✓ Valid' if len(result['request_id']) == 36 else '✗ Invalid'}")
+            out.append(f"  → UUID format: {'✓ Valid' if len(result['request_id']) == 36 else '✗ Invalid'}")
         
-        print(f"\nFull Response:")
-        print(json.dumps(result, indent=2))
+        out.append(f"\nFull Response:")
+        out.append(json.dumps(result, indent=2))
         
         return result
     except requests.exceptions.RequestException as e:
-        print(f"\n✗ Error: {e}")
+        out.append(f"\n✗ Error: {e}")
         if hasattr(e, 'response') and e.response is not None:
-            print(f"Response: {e.response.text}")
+            out.append(f"Response: {e.response.text}")
         return None
+    finally:
+        with _PRINT_LOCK:
+            print("\n".join(out), flush=True)
+
+def read_last_entry(log_file):
+    """
+    Return the last JSON entry in log_file and the number of lines.
+    
+    Maps the file instead of reading it into a list of lines; only the
+    last line is decoded.
+    """
+    with open(log_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None, 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            trailing_newline = mm[end - 1:end] == b'\n'
+            if trailing_newline:
+                end -= 1
+            start = mm.rfind(b'\n', 0, end) + 1
+            latest = json_loads(mm[start:end])
+            # mmap has no count(); count newlines a chunk at a time
+            count = sum(
+                mm[i:i + READ_CHUNK_SIZE].count(b'\n')
+                for i in range(0, len(mm), READ_CHUNK_SIZE)
+            )
+    return latest, count + (not trailing_newline)
 
 def check_audit_logs():
     """Check if audit logs are being created"""
@@ -53,7 +105,7 @@ def check_audit_logs():
         return
     
     # Find today's log file
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = time.strftime("%Y-%m-%d")
     log_file = AUDIT_LOG_DIR / f"audit_{today}.jsonl"
     
     if not log_file.exists():
@@ -65,14 +117,12 @@ def check_audit_logs():
     
     # Read and display recent entries
     try:
-        with open(log_file, 'r') as f:
-            lines = f.readlines()
+        latest, count = read_last_entry(log_file)
         
-        print(f"✓ Found {len(lines)} log entries")
+        print(f"✓ Found {count} log entries")
         
-        if lines:
+        if latest is not None:
             print(f"\nMost recent entry:")
-            latest = json.loads(lines[-1])
             print(json.dumps(latest, indent=2))
             
             # Check for request_id in log
@@ -89,52 +139,55 @@ def main():
     print(f"Testing against: {BASE_URL}")
     print(f"Audit log directory: {AUDIT_LOG_DIR.absolute()}")
     
-    # Test 1: KYC endpoint
-    print_section("Test 1: KYC Endpoint")
-    kyc_result = test_endpoint(
-        "KYC /verify",
-        f"{BASE_URL}/kyc/verify",
-        {
-            "full_name": "John Doe",
-            "dob": "1990-01-01",
-            "nationality": "US",
-            "document_type": "passport",
-            "document_number": "P1234567"
-        }
-    )
-    
-    # Test 2: AML endpoint
-    print_section("Test 2: AML Endpoint")
-    aml_result = test_endpoint(
-        "AML /screen",
-        f"{BASE_URL}/aml/screen",
-        {
-            "full_name": "Ahmed Ali",
-            "dob": "1989-03-12",
-            "nationality": "QA"
-        }
-    )
-    
-    # Test 3: Combined Risk endpoint
-    print_section("Test 3: Combined Risk Endpoint")
-    risk_result = test_endpoint(
-        "Risk /combined",
-        f"{BASE_URL}/risk/combined",
-        {
-            "aml_data": {
-                "full_name": "Jane Smith",
-                "dob": "1992-05-15",
-                "nationality": "GB"
-            },
-            "kyc_data": {
-                "full_name": "Jane Smith",
-                "dob": "1992-05-15",
-                "nationality": "GB",
+    endpoints = [
+        (
+            "Test 1: KYC Endpoint",
+            "KYC /verify",
+            f"{BASE_URL}/kyc/verify",
+            {
+                "full_name": "John Doe",
+                "dob": "1990-01-01",
+                "nationality": "US",
                 "document_type": "passport",
-                "document_number": "GB123456"
+                "document_number": "P1234567"
+            }
+        ),
+        (
+            "Test 2: AML Endpoint",
+            "AML /screen",
+            f"{BASE_URL}/aml/screen",
+            {
+                "full_name": "Ahmed Ali",
+                "dob": "1989-03-12",
+                "nationality": "QA"
             }
-        }
-    )
+        ),
+        (
+            "Test 3: Combined Risk Endpoint",
+            "Risk /combined",
+            f"{BASE_URL}/risk/combined",
+            {
+                "aml_data": {
+                    "full_name": "Jane Smith",
+                    "dob": "1992-05-15",
+                    "nationality": "GB"
+                },
+                "kyc_data": {
+                    "full_name": "Jane Smith",
+                    "dob": "1992-05-15",
+                    "nationality": "GB",
+                    "document_type": "passport",
+                    "document_number": "GB123456"
+                }
+            }
+        ),
+    ]
+    
+    # The endpoints are independent requests, so send them side by side
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+        kyc_result, aml_result, risk_result = executor.map(
+            lambda endpoint: test_endpoint(*endpoint), endpoints
+        )
     
     # Check audit logs
     check_audit_logs()
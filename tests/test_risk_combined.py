@@ -5,41 +5,53 @@ Run this after starting the server: uvicorn app.main:app --reload
 """
 import requests
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "http://127.0.0.1:8000"
 
+# One keep-alive session shared by the scenario threads
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+SESSION.headers["Content-Type"] = "application/json"
+
+_PRINT_LOCK = threading.Lock()
+
 def test_combined_risk(payload, test_name):
     """Test combined risk endpoint"""
-    print(f"\n{'='*60}")
-    print(f"TEST: {test_name}")
-    print(f"{'='*60}")
-    print(f"Request: {json.dumps(payload, indent=2, default=str)}")
+    # Scenarios run concurrently, so collect the report and print it in one piece
+    out = [
+        f"\n{'='*60}",
+        f"TEST: {test_name}",
+        f"{'='*60}",
+        f"Request: {json.dumps(payload, indent=2, default=str)}",
+    ]
     
     try:
-        response = requests.post(
-            f"{BASE_URL}/risk/combined",
-            json=payload,
-            headers={"Content-Type": "application/json"}
-        )
+        response = SESSION.post(f"{BASE_URL}/risk/combined", json=payload)
         response.raise_for_status()
         result = response.json()
         
-        print(f"\nResponse:")
-        print(json.dumps(result, indent=2, default=str))
-        print(f"\n✓ Combined Risk Score: {result.get('combined_risk_score')}")
-        print(f"✓ Combined Risk Level: {result.get('combined_risk_level')}")
+        out.append(f"\nResponse:")
+        out.append(json.dumps(result, indent=2, default=str))
+        out.append(f"\n✓ Combined Risk Score: {result.get('combined_risk_score')}")
+        out.append(f"✓ Combined Risk Level: {result.get('combined_risk_level')}")
         if result.get('aml_risk_score') is not None:
-            print(f"✓ AML Risk: {result.get('aml_risk_score')} ({result.get('aml_risk_level')})")
+            out.append(f"✓ AML Risk: {result.get('aml_risk_score')} ({result.get('aml_risk_level')})")
         if result.get('kyc_risk_score') is not None:
-            print(f"✓ KYC Risk: {result.get('kyc_risk_score')} ({result.get('kyc_risk_level')})")
-        print(f"✓ Risk Factors: {len(result.get('risk_factors', []))}")
+            out.append(f"✓ KYC Risk: {result.get('kyc_risk_score')} ({result.get('kyc_risk_level')})")
+        out.append(f"✓ Risk Factors: {len(result.get('risk_factors', []))}")
         
         return result
     except requests.exceptions.RequestException as e:
-        print(f"\n✗ Error: {e}")
+        out.append(f"\n✗ Error: {e}")
         if hasattr(e, 'response') and e.response is not None:
-            print(f"Response: {e.response.text}")
+            out.append(f"Response: {e.response.text}")
         return None
+    finally:
+        with _PRINT_LOCK:
+            print("\n".join(out), flush=True)
 
 def main():
     """Run all test scenarios"""
@@ -48,79 +60,85 @@ def main():
     print("="*60)
     print(f"Testing against: {BASE_URL}")
     
-    # Test 1: Both AML and KYC data
-    test_combined_risk(
-        {
-            "aml_data": {
-                "full_name": "Ahmed Ali",
-                "dob": "1989-03-12",
-                "nationality": "QA"
+    scenarios = [
+        # Test 1: Both AML and KYC data
+        (
+            {
+                "aml_data": {
+                    "full_name": "Ahmed Ali",
+                    "dob": "1989-03-12",
+                    "nationality": "QA"
+                },
+                "kyc_data": {
+                    "full_name": "Ahmed Ali",
+                    "dob": "1989-03-12",
+                    "nationality": "QA",
+                    "document_type": "passport",
+                    "document_number": "P1234567"
+                }
             },
-            "kyc_data": {
-                "full_name": "Ahmed Ali",
-                "dob": "1989-03-12",
-                "nationality": "QA",
-                "document_type": "passport",
-                "document_number": "P1234567"
-            }
-        },
-        "1. Both AML and KYC Data (Full Assessment)"
-    )
-    
-    # Test 2: Only AML data
-    test_combined_risk(
-        {
-            "aml_data": {
-                "full_name": "John Doe",
-                "dob": "1990-01-01",
-                "nationality": "US"
-            }
-        },
-        "2. Only AML Data"
-    )
-    
-    # Test 3: Only KYC data
-    test_combined_risk(
-        {
-            "kyc_data": {
-                "full_name": "Juan Dela Cruz",
-                "dob": "1990-01-01",
-                "nationality": "PH",
-                "document_type": "passport",
-                "document_number": "P1234567"
-            }
-        },
-        "3. Only KYC Data"
-    )
-    
-    # Test 4: Pre-calculated risks
-    test_combined_risk(
-        {
-            "aml_risk": {
-                "risk_score": 50,
-                "risk_level": "medium",
-                "risk_factors": [
-                    {
-                        "type": "aml_sanctions",
-                        "severity": "medium",
-                        "description": "Sanctions match found"
-                    }
-                ]
+            "1. Both AML and KYC Data (Full Assessment)"
+        ),
+        
+        # Test 2: Only AML data
+        (
+            {
+                "aml_data": {
+                    "full_name": "John Doe",
+                    "dob": "1990-01-01",
+                    "nationality": "US"
+                }
             },
-            "kyc_risk": {
-                "risk_score": 30,
-                "risk_level": "low",
-                "risk_factors": [
-                    {
-                        "type": "kyc_document",
-                        "severity": "low",
-                        "description": "Document format valid"
-                    }
-                ]
-            }
-        },
-        "4. Pre-calculated Risks"
-    )
+            "2. Only AML Data"
+        ),
+        
+        # Test 3: Only KYC data
+        (
+            {
+                "kyc_data": {
+                    "full_name": "Juan Dela Cruz",
+                    "dob": "1990-01-01",
+                    "nationality": "PH",
+                    "document_type": "passport",
+                    "document_number": "P1234567"
+                }
+            },
+            "3. Only KYC Data"
+        ),
+        
+        # Test 4: Pre-calculated risks
+        (
+            {
+                "aml_risk": {
+                    "risk_score": 50,
+                    "risk_level": "medium",
+                    "risk_factors": [
+                        {
+                            "type": "aml_sanctions",
+                            "severity": "medium",
+                            "description": "Sanctions match found"
+                        }
+                    ]
+                },
+                "kyc_risk": {
+                    "risk_score": 30,
+                    "risk_level": "low",
+                    "risk_factors": [
+                        {
+                            "type": "kyc_document",
+                            "severity": "low",
+                            "description": "Document format valid"
+                        }
+                    ]
+                }
+            },
+            "4. Pre-calculated Risks"
+        ),
+    ]
+    
+    # The scenarios are independent requests, so send them side by side
+    with ThreadPoolExecutor(max_workers=len(scenarios)) as executor:
+        list(executor.map(lambda scenario: test_combined_risk(*scenario), scenarios))
     
     print("\n" + "="*60)
     print("All tests completed!")
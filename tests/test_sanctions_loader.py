@@ -1,5 +1,9 @@
 """
 Tests for the sanctions_loader module.
+
+The tests don't share files they write, so they can run in parallel with
+pytest-xdist:
+    python -m pytest tests/test_sanctions_loader.py -n auto
 """
 import pytest
 import pandas as pd
@@ -25,11 +29,10 @@ TEST_MISSING_NAME = """source,source_file,record_type,dataid,name,aliases,nation
 UN,test.csv,individual,1,John Doe,J. Doe,US
 EU,test.csv,entity,2,,,"""
 
-@pytest.fixture
-def temp_sanctions_dir(tmp_path):
-    """Create a temporary directory with a sample sanctions file."""
+def _make_sanctions_dir(root: Path) -> Dict[str, Union[Path, str]]:
+    """Create a directory tree with sample sanctions files under root."""
     # Create directory structure
-    sanctions_dir = tmp_path / "data" / "sanctions"
+    sanctions_dir = root / "data" / "sanctions"
     combined_dir = sanctions_dir / "combined"
     combined_dir.mkdir(parents=True)
     
@@ -43,11 +46,11 @@ def temp_sanctions_dir(tmp_path):
     parent_file.write_text(SAMPLE_DATA)
     
     # Create a test file with a missing name
-    missing_name_file = tmp_path / "test_missing_name.csv"
+    missing_name_file = root / "test_missing_name.csv"
     missing_name_file.write_text(TEST_MISSING_NAME)
     
     return {
-        'root': tmp_path,
+        'root': root,
         'sanctions_dir': sanctions_dir,
         'combined_dir': combined_dir,
         'sample_file': sample_file,
@@ -55,10 +58,38 @@ def temp_sanctions_dir(tmp_path):
         'missing_name_file': missing_name_file
     }
 
-def test_load_returns_dataframe(temp_sanctions_dir: Dict[str, Union[Path, str]]) -> None:
+@pytest.fixture(scope="session")
+def temp_sanctions_dir(tmp_path_factory):
+    """
+    Create a temporary directory with a sample sanctions file, once per session.
+    
+    Tests must not add or change files in it; those that do use
+    fresh_sanctions_dir instead. The tree is checked on teardown so a test
+    that writes into it (e.g. a Parquet copy) is caught rather than leaking
+    into later tests.
+    """
+    paths = _make_sanctions_dir(tmp_path_factory.mktemp("sanctions_root"))
+    before = {p: p.stat().st_mtime_ns for p in paths['root'].rglob('*')}
+    yield paths
+    after = {p: p.stat().st_mtime_ns for p in paths['root'].rglob('*')}
+    assert after == before, "shared sanctions directory was modified"
+
+@pytest.fixture
+def fresh_sanctions_dir(tmp_path):
+    """Create a temporary directory with a sample sanctions file for one test."""
+    return _make_sanctions_dir(tmp_path)
+
+@pytest.mark.parametrize("arrow_strings", [False, True], ids=["numpy", "pyarrow"])
+def test_load_returns_dataframe(temp_sanctions_dir: Dict[str, Union[Path, str]], arrow_strings: bool) -> None:
     """Test that load() returns a DataFrame with the expected structure."""
-    # Test loading the sample file directly
-    df = SanctionsLoader.load(temp_sanctions_dir['sample_file'])
+    if arrow_strings:
+        pytest.importorskip("pyarrow")
+    
+    # Test loading the sample file directly; clear the cache so each
+    # parametrization parses the file itself
+    SanctionsLoader.clear_cache()
+    with patch('app.services.sanctions_loader.PYARROW_AVAILABLE', arrow_strings):
+        df = SanctionsLoader.load(temp_sanctions_dir['sample_file'])
     
     # Check basic structure
     assert isinstance(df, pd.DataFrame)
@@ -95,13 +126,13 @@ def test_no_nans_in_string_columns(temp_sanctions_dir: Dict[str, Union[Path, str
         if col in df.columns:
             assert df[col].isna().sum() == 0, f"Column {col} contains NaN values"
 
-def test_drop_rows_without_name(temp_sanctions_dir: Dict[str, Union[Path, str]]) -> None:
+def test_drop_rows_without_name(tmp_path: Path) -> None:
     """Test that rows without a name are dropped."""
     # Create a test file with one valid and one invalid row
     test_data = """source,source_file,record_type,dataid,name,aliases,nationalities,last_updated,processing_date
 UN,test.csv,individual,1,John Doe,J. Doe,US,2023-01-01,2023-01-02
 EU,test.csv,entity,2,,,US,2023-01-03,2023-01-04"""
-    test_file = temp_sanctions_dir['combined_dir'] / "test_missing_name.csv"
+    test_file = tmp_path / "test_missing_name.csv"
     test_file.write_text(test_data)
     
     df = SanctionsLoader.load(test_file)
@@ -125,6 +156,42 @@ def test_cache_behavior(temp_sanctions_dir: Dict[str, Union[Path, str]]) -> None
     df3 = SanctionsLoader.load(temp_sanctions_dir['sample_file'])
     assert df1.equals(df3)  # Should have the same data
 
+def test_path_load_is_cached_until_modified(fresh_sanctions_dir: Dict[str, Union[Path, str]]) -> None:
+    """Test that loading a file by path reuses the parsed data until the file changes."""
+    sample_file = fresh_sanctions_dir['sample_file']
+    SanctionsLoader.clear_cache()
+    try:
+        with patch.object(SanctionsLoader, '_read_sanctions_file',
+                          wraps=SanctionsLoader._read_sanctions_file) as mock_read:
+            df1 = SanctionsLoader.load(sample_file)
+            df2 = SanctionsLoader.load(sample_file)
+            assert df2 is df1
+            assert mock_read.call_count == 1
+            
+            # Touching the file makes the next load read it again
+            mtime_ns = sample_file.stat().st_mtime_ns
+            os.utime(sample_file, ns=(mtime_ns + 1_000_000_000, mtime_ns + 1_000_000_000))
+            df3 = SanctionsLoader.load(sample_file)
+            assert df3 is not df1
+            assert mock_read.call_count == 2
+        assert df3.equals(df1)
+    finally:
+        SanctionsLoader.clear_cache()
+
+def test_default_load_is_cached(temp_sanctions_dir: Dict[str, Union[Path, str]]) -> None:
+    """Test that loading the latest file reads it once and then reuses it."""
+    SanctionsLoader.clear_cache()
+    try:
+        with patch.object(SanctionsLoader, '_find_latest_sanctions_file',
+                          return_value=temp_sanctions_dir['sample_file']) as mock_find:
+            df1 = SanctionsLoader.load()
+            df2 = SanctionsLoader.load()
+        
+        assert df2 is df1
+        assert mock_find.call_count == 1
+    finally:
+        SanctionsLoader.clear_cache()
+
 def test_load_sanctions_function(temp_sanctions_dir: Dict[str, Union[Path, str]]) -> None:
     """Test that the load_sanctions() function works as expected."""
     # Test that the function loads data correctly
@@ -142,14 +209,14 @@ def test_missing_file_error() -> None:
         SanctionsLoader.load("this_file_does_not_exist_1234567890.csv")
     assert "not found" in str(excinfo.value).lower()
 
-def test_find_latest_file(temp_sanctions_dir: Dict[str, Union[Path, str]]) -> None:
+def test_find_latest_file(fresh_sanctions_dir: Dict[str, Union[Path, str]]) -> None:
     """Test that the latest file is found correctly."""
     # Create a new file with a newer timestamp
-    new_file = temp_sanctions_dir['combined_dir'] / "combined_sanctions_newest.csv"
+    new_file = fresh_sanctions_dir['combined_dir'] / "combined_sanctions_newest.csv"
     new_file.write_text(SAMPLE_DATA)
     
     # The loader should pick the newest file
-    found_file = SanctionsLoader._find_latest_sanctions_file(temp_sanctions_dir['combined_dir'])
+    found_file = SanctionsLoader._find_latest_sanctions_file(fresh_sanctions_dir['combined_dir'])
     assert found_file.name == "combined_sanctions_newest.csv"
 
 def test_backward_compatibility(temp_sanctions_dir: Dict[str, Union[Path, str]]) -> None:
@@ -163,21 +230,70 @@ def test_backward_compatibility(temp_sanctions_dir: Dict[str, Union[Path, str]])
     df2 = load_sanctions(temp_sanctions_dir['sample_file'])
     assert df.equals(df2)
 
+def test_prefers_parquet_copy(fresh_sanctions_dir: Dict[str, Union[Path, str]]) -> None:
+    """Test that a Parquet copy next to the CSV is loaded instead of the CSV."""
+    pytest.importorskip("pyarrow")
+    sample_file = fresh_sanctions_dir['sample_file']
+    expected = SanctionsLoader.load(sample_file)
+    
+    pd.read_csv(sample_file, dtype=str, keep_default_na=False).to_parquet(sample_file.with_suffix('.parquet'), index=False)
+    SanctionsLoader.clear_cache()
+    with patch('pandas.read_csv') as mock_read_csv:
+        df = SanctionsLoader.load(sample_file)
+    
+    mock_read_csv.assert_not_called()
+    assert df.equals(expected)
+
+def test_parquet_copy_ignored_without_pyarrow(fresh_sanctions_dir: Dict[str, Union[Path, str]]) -> None:
+    """Test that the CSV is read when pyarrow is unavailable, even if a Parquet copy exists."""
+    sample_file = fresh_sanctions_dir['sample_file']
+    sample_file.with_suffix('.parquet').write_bytes(b"not parquet")
+    with patch('app.services.sanctions_loader.PYARROW_AVAILABLE', False), \
+            patch('pandas.read_parquet') as mock_read_parquet:
+        df = SanctionsLoader.load(sample_file)
+    
+    mock_read_parquet.assert_not_called()
+    assert df['dataid'].tolist() == ['1', '2']
+
+def test_combined_parquet_and_csv_load_equal(tmp_path: Path) -> None:
+    """Test that the CSV and Parquet copy written by combine_sanctions.py load to the same frame."""
+    pytest.importorskip("pyarrow")
+    from scripts.combine_sanctions import SanctionsCombiner
+    
+    normalized_dir = tmp_path / "sanctions" / "normalized" / "un"
+    normalized_dir.mkdir(parents=True)
+    (normalized_dir / "un_latest.csv").write_text(SAMPLE_DATA)
+    combiner = SanctionsCombiner(tmp_path / "sanctions", tmp_path / "combined")
+    csv_file = Path(combiner.save_combined_file(combiner.combine_sanctions()))
+    parquet_file = csv_file.with_suffix('.parquet')
+    assert parquet_file.exists()
+    
+    SanctionsLoader.clear_cache()
+    try:
+        with patch('pandas.read_csv') as mock_read_csv:
+            from_parquet = SanctionsLoader.load(csv_file)
+        mock_read_csv.assert_not_called()
+        
+        parquet_file.unlink()
+        SanctionsLoader.clear_cache()
+        from_csv = SanctionsLoader.load(csv_file)
+    finally:
+        SanctionsLoader.clear_cache()
+    
+    assert from_csv.dtypes.equals(from_parquet.dtypes)
+    assert from_csv.equals(from_parquet)
+    assert from_csv['id'].tolist() == ['1', '2']
+
 @patch('pandas.read_csv')
-def test_error_handling(mock_read_csv: MagicMock) -> None:
+def test_error_handling(mock_read_csv: MagicMock, tmp_path: Path) -> None:
     """Test error handling when reading the CSV fails."""
     # Set up the mock to raise an exception
     mock_read_csv.side_effect = Exception("Test error")
     
-    # Create a temporary file
-    test_file = Path("test_error.csv")
-    test_file.touch()  # Create an empty file
+    # Create an empty file
+    test_file = tmp_path / "test_error.csv"
+    test_file.touch()
     
-    try:
-        with pytest.raises(Exception) as excinfo:
-            SanctionsLoader.load(test_file)
-        assert "Test error" in str(excinfo.value)
-    finally:
-        # Clean up
-        if test_file.exists():
-            test_file.unlink()
+    with pytest.raises(Exception) as excinfo:
+        SanctionsLoader.load(test_file)
+    assert "Test error" in str(excinfo.value)
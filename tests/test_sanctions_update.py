@@ -5,22 +5,30 @@ This test suite verifies that all 4 sanction lists (UN, OFAC, UK, EU) can be:
 1. Downloaded successfully
 2. Converted to normalized CSV format
 3. Combined into a single unified list
+
+Every test works on its own temp directories and mocks, so the file can run
+in parallel with pytest-xdist:
+    python -m pytest tests/test_sanctions_update.py -n auto
 """
 import pytest
+import io
+import json
+import os
 import sys
 import subprocess
 from pathlib import Path
-from unittest.mock import patch, MagicMock, Mock
-from typing import Tuple, Optional
-import tempfile
-import shutil
-import asyncio
+from unittest.mock import patch, Mock
+from requests.structures import CaseInsensitiveDict
 
-# Add project root to path
+# Add project root to path when run directly; under pytest the rootdir is
+# already on it
 PROJECT_ROOT = Path(__file__).parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
 from scripts.update_sanctions import (
+    HTTP_CACHE_FILENAME,
+    download_file,
     download_un_sanctions,
     download_ofac_sanctions,
     download_uk_sanctions,
@@ -33,30 +41,38 @@ from scripts.update_sanctions import (
 class TestSanctionsDownload:
     """Test downloading of individual sanction lists."""
     
-    @pytest.fixture
-    def temp_data_dir(self, tmp_path):
-        """Create temporary data directory structure."""
-        data_dir = tmp_path / "app" / "data" / "sanctions"
+    @pytest.fixture(scope="class")
+    def temp_data_dir(self, tmp_path_factory):
+        """
+        Create temporary data directory structure, once for the class.
+        
+        The downloads are mocked, so no test writes into it.
+        """
+        data_dir = tmp_path_factory.mktemp("download") / "app" / "data" / "sanctions"
         raw_dir = data_dir / "raw"
         for source in ["un", "ofac", "uk", "eu"]:
             (raw_dir / source).mkdir(parents=True, exist_ok=True)
         return data_dir
     
+    @pytest.fixture(autouse=True)
+    def use_temp_raw_dir(self, monkeypatch, temp_data_dir):
+        """Point the downloads at the temporary raw directory."""
+        monkeypatch.setattr('scripts.update_sanctions.RAW_DIR', temp_data_dir / "raw")
+    
     @patch('scripts.update_sanctions.download_file')
     def test_download_un_sanctions(self, mock_download, temp_data_dir):
         """Test UN sanctions download."""
         # Mock successful download
         mock_download.return_value = (True, "Downloaded 1.5 MB")
         
-        # Mock the file operations
-        with patch('scripts.update_sanctions.RAW_DIR', temp_data_dir / "raw"):
-            with patch('shutil.move') as mock_move:
-                success, file_path = download_un_sanctions()
-                
-                assert success is True
-                assert file_path is not None
-                assert "consolidatedLegacyByPRN.xml" in str(file_path)
-                mock_download.assert_called_once()
+        success, file_path = download_un_sanctions()
+        
+        assert success is True
+        assert file_path is not None
+        assert "consolidatedLegacyByPRN.xml" in str(file_path)
+        # The download goes straight to the name the converter expects
+        mock_download.assert_called_once()
+        assert mock_download.call_args[0][1] == file_path
     
     @patch('scripts.update_sanctions.download_file')
     def test_download_ofac_sanctions(self, mock_download, temp_data_dir):
@@ -64,64 +80,191 @@ class TestSanctionsDownload:
         # Mock successful downloads for all 3 files
         mock_download.return_value = (True, "Downloaded 2.0 MB")
         
-        with patch('scripts.update_sanctions.RAW_DIR', temp_data_dir / "raw"):
-            success, files = download_ofac_sanctions()
+        success, files = download_ofac_sanctions()
             
-            assert success is True
-            assert len(files) == 3  # Should download SDN, ALT, ADD
-            assert all("sdn.csv" in str(f) or "alt.csv" in str(f) or "add.csv" in str(f) for f in files)
-            assert mock_download.call_count == 3
+        assert success is True
+        assert len(files) == 3  # Should download SDN, ALT, ADD
+        assert all("sdn.csv" in str(f) or "alt.csv" in str(f) or "add.csv" in str(f) for f in files)
+        assert mock_download.call_count == 3
     
+    @pytest.mark.parametrize("download", [download_uk_sanctions, download_eu_sanctions], ids=["uk", "eu"])
     @patch('scripts.update_sanctions.PLAYWRIGHT_AVAILABLE', False)
-    def test_download_uk_sanctions_no_playwright(self, temp_data_dir):
-        """Test UK sanctions download when Playwright is not available."""
-        with patch('scripts.update_sanctions.RAW_DIR', temp_data_dir / "raw"):
-            success, file_path = download_uk_sanctions()
-            # Should return False when Playwright is not available
-            assert success is False
-            assert file_path is None
+    def test_download_no_playwright(self, temp_data_dir, download):
+        """Test UK/EU sanctions download when Playwright is not available."""
+        success, file_path = download()
+        # Should return False when Playwright is not available
+        assert success is False
+        assert file_path is None
     
+    @pytest.mark.parametrize("source,download", [
+        ("uk", download_uk_sanctions),
+        ("eu", download_eu_sanctions),
+    ], ids=["uk", "eu"])
     @patch('scripts.update_sanctions.PLAYWRIGHT_AVAILABLE', True)
     @patch('asyncio.run')
-    def test_download_uk_sanctions_with_playwright(self, mock_run, temp_data_dir):
-        """Test UK sanctions download when Playwright is available."""
+    def test_download_with_playwright(self, mock_run, temp_data_dir, source, download):
+        """Test UK/EU sanctions download when Playwright is available."""
         # Mock asyncio.run to return success
-        mock_run.return_value = (True, temp_data_dir / "raw" / "uk" / "test.csv")
-        
-        with patch('scripts.update_sanctions.RAW_DIR', temp_data_dir / "raw"):
-            success, file_path = download_uk_sanctions()
-            # Should call asyncio.run with the async function
-            assert mock_run.called
-            assert success is True
-            assert file_path is not None
+        mock_run.return_value = (True, temp_data_dir / "raw" / source / "test.csv")
+        
+        success, file_path = download()
+        # Should call asyncio.run with the async function
+        assert mock_run.called
+        assert success is True
+        assert file_path is not None
+
+
+class TestFreshnessSkip:
+    """Test that recent downloads are reused unless the update is forced."""
+    
+    @pytest.fixture(autouse=True)
+    def raw_dir(self, monkeypatch, tmp_path):
+        """Point the downloads at a per-test raw directory."""
+        raw_dir = tmp_path / "raw"
+        monkeypatch.setattr('scripts.update_sanctions.RAW_DIR', raw_dir)
+        return raw_dir
+    
+    @pytest.fixture
+    def un_file(self, raw_dir):
+        """An existing UN download, written just now."""
+        path = raw_dir / "un" / "consolidatedLegacyByPRN.xml"
+        path.parent.mkdir(parents=True)
+        path.write_text("<list/>")
+        return path
+    
+    @patch('scripts.update_sanctions.download_file')
+    def test_fresh_file_skips_download(self, mock_download, un_file):
+        """Test that a recent file is returned without downloading."""
+        success, file_path = download_un_sanctions()
+        
+        assert success is True
+        assert file_path == un_file
+        mock_download.assert_not_called()
+    
+    @patch('scripts.update_sanctions.download_file')
+    def test_force_downloads_fresh_file(self, mock_download, un_file):
+        """Test that force=True downloads even when the file is recent."""
+        mock_download.return_value = (True, "Downloaded 1.5 MB")
+        
+        success, file_path = download_un_sanctions(force=True)
+        
+        assert success is True
+        mock_download.assert_called_once()
+        assert mock_download.call_args[0][1] == un_file
+    
+    @patch('scripts.update_sanctions.download_file')
+    def test_stale_file_is_downloaded(self, mock_download, un_file):
+        """Test that a file older than its max age is downloaded again."""
+        os.utime(un_file, (0, 0))
+        mock_download.return_value = (True, "Downloaded 1.5 MB")
+        
+        success, _ = download_un_sanctions()
+        
+        assert success is True
+        mock_download.assert_called_once()
     
     @patch('scripts.update_sanctions.PLAYWRIGHT_AVAILABLE', False)
-    def test_download_eu_sanctions_no_playwright(self, temp_data_dir):
-        """Test EU sanctions download when Playwright is not available."""
-        with patch('scripts.update_sanctions.RAW_DIR', temp_data_dir / "raw"):
-            success, file_path = download_eu_sanctions()
-            # Should return False when Playwright is not available
-            assert success is False
-            assert file_path is None
+    def test_fresh_browser_download_skips_playwright(self, raw_dir):
+        """Test that a recent UK file is found by pattern and reused without Playwright."""
+        uk_file = raw_dir / "uk" / "uk_sanctions_20250101.csv"
+        uk_file.parent.mkdir(parents=True)
+        uk_file.write_text("Name 6\n")
+        
+        assert download_uk_sanctions() == (True, uk_file)
+        assert download_uk_sanctions(force=True) == (False, None)
+
+
+class TestConditionalDownload:
+    """Test the ETag/Last-Modified handling of download_file."""
     
-    @patch('scripts.update_sanctions.PLAYWRIGHT_AVAILABLE', True)
-    @patch('asyncio.run')
-    def test_download_eu_sanctions_with_playwright(self, mock_run, temp_data_dir):
-        """Test EU sanctions download when Playwright is available."""
-        # Mock asyncio.run to return success
-        mock_run.return_value = (True, temp_data_dir / "raw" / "eu" / "test.csv")
-        
-        with patch('scripts.update_sanctions.RAW_DIR', temp_data_dir / "raw"):
-            success, file_path = download_eu_sanctions()
-            # Should call asyncio.run with the async function
-            assert mock_run.called
-            assert success is True
-            assert file_path is not None
+    URL = "https://example.com/consolidated.xml"
+    ETAG = '"abc123"'
+    LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+    
+    @pytest.fixture(autouse=True)
+    def raw_dir(self, monkeypatch, tmp_path):
+        """Keep the validator cache in a per-test raw directory."""
+        raw_dir = tmp_path / "raw"
+        monkeypatch.setattr('scripts.update_sanctions.RAW_DIR', raw_dir)
+        return raw_dir
+    
+    @staticmethod
+    def make_response(status_code, body=b"", headers=None):
+        """Build a streamed response as returned by SESSION.get."""
+        return Mock(
+            status_code=status_code,
+            headers=CaseInsensitiveDict(headers or {}),
+            raw=io.BytesIO(body)
+        )
+    
+    def ok_response(self, body):
+        """Build a 200 response carrying both validators."""
+        return self.make_response(200, body, {
+            'Content-Length': str(len(body)),
+            'ETag': self.ETAG,
+            'Last-Modified': self.LAST_MODIFIED,
+        })
+    
+    @patch('scripts.update_sanctions.SESSION.get')
+    def test_200_stores_validators(self, mock_get, raw_dir):
+        """Test that a full download saves the file and its ETag/Last-Modified."""
+        output_path = raw_dir / "un" / "list.xml"
+        mock_get.return_value = self.ok_response(b"<list/>")
+        
+        success, _ = download_file(self.URL, output_path)
+        
+        assert success is True
+        assert output_path.read_bytes() == b"<list/>"
+        assert mock_get.call_args.kwargs['headers'] == {}
+        cache = json.loads((raw_dir / HTTP_CACHE_FILENAME).read_text())
+        assert cache[self.URL] == {
+            'path': str(output_path),
+            'etag': self.ETAG,
+            'last_modified': self.LAST_MODIFIED,
+        }
+    
+    @patch('scripts.update_sanctions.SESSION.get')
+    def test_next_download_is_conditional(self, mock_get, raw_dir):
+        """Test that the next download of the same URL sends the saved validators."""
+        output_path = raw_dir / "un" / "list.xml"
+        mock_get.return_value = self.ok_response(b"<list/>")
+        download_file(self.URL, output_path)
+        
+        mock_get.return_value = self.ok_response(b"<list/>")
+        download_file(self.URL, output_path)
+        
+        headers = mock_get.call_args.kwargs['headers']
+        assert headers['If-None-Match'] == self.ETAG
+        assert headers['If-Modified-Since'] == self.LAST_MODIFIED
+    
+    @patch('scripts.update_sanctions.SESSION.get')
+    def test_304_keeps_existing_file(self, mock_get, raw_dir):
+        """Test that a 304 reply leaves the file's content alone and marks it fresh."""
+        output_path = raw_dir / "un" / "list.xml"
+        mock_get.return_value = self.ok_response(b"<list/>")
+        download_file(self.URL, output_path)
+        os.utime(output_path, (0, 0))
+        
+        mock_get.return_value = self.make_response(304)
+        success, message = download_file(self.URL, output_path)
+        
+        assert success is True
+        assert message == "Not modified"
+        assert output_path.read_bytes() == b"<list/>"
+        assert output_path.stat().st_mtime > 0
+        assert not output_path.with_name(output_path.name + ".tmp").exists()
 
 
 class TestSanctionsConversion:
     """Test conversion scripts for each sanction list."""
     
+    @pytest.fixture(autouse=True)
+    def mock_run(self):
+        """Patch subprocess.run once per test, succeeding by default."""
+        with patch('scripts.update_sanctions.subprocess.run') as mock_run:
+            mock_run.return_value = Mock(returncode=0)
+            yield mock_run
+    
     def test_conversion_scripts_exist(self):
         """Verify all conversion scripts exist."""
         scripts_dir = PROJECT_ROOT / "scripts"
@@ -133,64 +276,26 @@ class TestSanctionsConversion:
             "combine_sanctions.py"
         ]
         
-        for script in required_scripts:
-            script_path = scripts_dir / script
-            assert script_path.exists(), f"Required script {script} not found at {script_path}"
+        # List the directory once rather than stat each script
+        present = {path.name for path in scripts_dir.iterdir()}
+        missing = [script for script in required_scripts if script not in present]
+        assert not missing, f"Required scripts not found in {scripts_dir}: {', '.join(missing)}"
     
-    @patch('scripts.update_sanctions.subprocess.run')
-    def test_convert_un_script(self, mock_run):
-        """Test UN conversion script execution."""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
-        
-        success = run_conversion_script("convert_un_to_csv.py")
+    @pytest.mark.parametrize("script", [
+        "convert_un_to_csv.py",
+        "convert_ofac_to_csv.py",
+        "convert_uk_to_csv.py",
+        "convert_eu_to_csv.py",
+    ])
+    def test_convert_script(self, mock_run, script):
+        """Test conversion script execution for each list."""
+        success = run_conversion_script(script)
         assert success is True
         mock_run.assert_called_once()
         # Verify the script name is in the command
         call_args = mock_run.call_args[0][0]
-        assert any("convert_un_to_csv.py" in str(arg) for arg in call_args)
+        assert any(script in str(arg) for arg in call_args)
     
-    @patch('scripts.update_sanctions.subprocess.run')
-    def test_convert_ofac_script(self, mock_run):
-        """Test OFAC conversion script execution."""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
-        
-        success = run_conversion_script("convert_ofac_to_csv.py")
-        assert success is True
-        mock_run.assert_called_once()
-        call_args = mock_run.call_args[0][0]
-        assert any("convert_ofac_to_csv.py" in str(arg) for arg in call_args)
-    
-    @patch('scripts.update_sanctions.subprocess.run')
-    def test_convert_uk_script(self, mock_run):
-        """Test UK conversion script execution."""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
-        
-        success = run_conversion_script("convert_uk_to_csv.py")
-        assert success is True
-        mock_run.assert_called_once()
-        call_args = mock_run.call_args[0][0]
-        assert any("convert_uk_to_csv.py" in str(arg) for arg in call_args)
-    
-    @patch('scripts.update_sanctions.subprocess.run')
-    def test_convert_eu_script(self, mock_run):
-        """Test EU conversion script execution."""
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_run.return_value = mock_result
-        
-        success = run_conversion_script("convert_eu_to_csv.py")
-        assert success is True
-        mock_run.assert_called_once()
-        call_args = mock_run.call_args[0][0]
-        assert any("convert_eu_to_csv.py" in str(arg) for arg in call_args)
-    
-    @patch('scripts.update_sanctions.subprocess.run')
     def test_convert_script_failure(self, mock_run):
         """Test conversion script failure handling."""
         mock_run.side_effect = subprocess.CalledProcessError(1, "script")
@@ -202,11 +307,16 @@ class TestSanctionsConversion:
 class TestSanctionsUpdateIntegration:
     """Integration tests for full sanctions update process."""
     
-    @pytest.fixture
-    def temp_project_structure(self, tmp_path):
-        """Create temporary project structure."""
+    @pytest.fixture(scope="class")
+    def temp_project_structure(self, tmp_path_factory):
+        """
+        Create temporary project structure, once for the class.
+        
+        Downloads and conversions are mocked, so no test writes into it.
+        """
+        root = tmp_path_factory.mktemp("project")
         # Create directory structure
-        data_dir = tmp_path / "app" / "data" / "sanctions"
+        data_dir = root / "app" / "data" / "sanctions"
         raw_dir = data_dir / "raw"
         normalized_dir = data_dir / "normalized"
         combined_dir = data_dir / "combined"
@@ -218,13 +328,20 @@ class TestSanctionsUpdateIntegration:
             (raw_dir / source).mkdir(parents=True, exist_ok=True)
         
         return {
-            'root': tmp_path,
+            'root': root,
             'data_dir': data_dir,
             'raw_dir': raw_dir,
             'normalized_dir': normalized_dir,
             'combined_dir': combined_dir
         }
     
+    @pytest.fixture(autouse=True)
+    def use_temp_dirs(self, monkeypatch, temp_project_structure):
+        """Point the update at the temporary data directories."""
+        monkeypatch.setattr('scripts.update_sanctions.RAW_DIR', temp_project_structure['raw_dir'])
+        monkeypatch.setattr('scripts.update_sanctions.NORMALIZED_DIR', temp_project_structure['normalized_dir'])
+        monkeypatch.setattr('scripts.update_sanctions.COMBINED_DIR', temp_project_structure['combined_dir'])
+    
     @patch('scripts.update_sanctions.download_un_sanctions')
     @patch('scripts.update_sanctions.download_ofac_sanctions')
     @patch('scripts.update_sanctions.download_uk_sanctions')
@@ -249,11 +366,7 @@ class TestSanctionsUpdateIntegration:
         # Mock successful conversions
         mock_convert.return_value = True
         
-        # Patch the directory paths
-        with patch('scripts.update_sanctions.RAW_DIR', temp_project_structure['raw_dir']):
-            with patch('scripts.update_sanctions.NORMALIZED_DIR', temp_project_structure['normalized_dir']):
-                with patch('scripts.update_sanctions.COMBINED_DIR', temp_project_structure['combined_dir']):
-                    exit_code = update_sanctions_lists(force=True)
+        exit_code = update_sanctions_lists(force=True)
         
         # Verify all 4 lists were attempted
         assert mock_download_un.called, "UN download should be called"
@@ -269,6 +382,11 @@ class TestSanctionsUpdateIntegration:
         assert any("convert_eu_to_csv.py" in str(call) for call in mock_convert.call_args_list)
         assert any("combine_sanctions.py" in str(call) for call in mock_convert.call_args_list)
         
+        # The UN parser pool is capped to leave a CPU for each other converter
+        un_call = next(call for call in mock_convert.call_args_list if "convert_un_to_csv.py" in str(call))
+        expected_workers = max((os.cpu_count() or 1) - 3, 1)
+        assert un_call.args[1] == {'UN_PARSE_WORKERS': str(expected_workers)}
+        
         # Should succeed if critical sources (UN, OFAC) work
         assert exit_code == 0
     
@@ -298,10 +416,7 @@ class TestSanctionsUpdateIntegration:
         # Conversions succeed
         mock_convert.return_value = True
         
-        with patch('scripts.update_sanctions.RAW_DIR', temp_project_structure['raw_dir']):
-            with patch('scripts.update_sanctions.NORMALIZED_DIR', temp_project_structure['normalized_dir']):
-                with patch('scripts.update_sanctions.COMBINED_DIR', temp_project_structure['combined_dir']):
-                    exit_code = update_sanctions_lists(force=True)
+        exit_code = update_sanctions_lists(force=True)
         
         # Should still succeed if critical sources work
         assert exit_code == 0
@@ -311,29 +426,26 @@ class TestSanctionsUpdateIntegration:
 
 
 class TestSanctionsUpdateReal:
-    """Real integration tests (optional, can be skipped with --skip-slow)."""
+    """Real integration tests (optional, run with --run-slow)."""
     
-    def test_real_un_download(self, request):
+    @pytest.mark.slow
+    def test_real_un_download(self, real_sanctions_downloads):
         """Test real UN sanctions download (slow test)."""
-        if not request.config.getoption("--run-slow"):
-            pytest.skip("use --run-slow to run")
-        success, file_path = download_un_sanctions()
+        success, file_path = real_sanctions_downloads["un"]
         assert success is True
         assert file_path is not None
         assert file_path.exists()
         assert file_path.suffix == ".xml"
     
-    def test_real_ofac_download(self, request):
+    @pytest.mark.slow
+    def test_real_ofac_download(self, real_sanctions_downloads):
         """Test real OFAC sanctions download (slow test)."""
-        if not request.config.getoption("--run-slow"):
-            pytest.skip("use --run-slow to run")
-        success, files = download_ofac_sanctions()
+        success, files = real_sanctions_downloads["ofac"]
         assert success is True
         assert len(files) > 0
         for file_path in files:
             assert file_path.exists()
             assert file_path.suffix == ".csv"
 
-
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])